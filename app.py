@@ -1,25 +1,160 @@
-from flask import Flask, render_template, request, jsonify, session, redirect, url_for
-import os
-from config import Config, DevelopmentConfig, ProductionConfig
-from controllers.auth_controller import AuthController
-from controllers.student_controller import StudentController
-from database.init_db import initialize_database
+from flask import (Flask, Response, g, render_template, request, jsonify, session, redirect, url_for,
+                   stream_with_context, send_from_directory)
+import mimetypes
+import time
+import click
+from config import get_config
+from controllers.auth_controller import AuthController, teacher_cache
+from controllers.student_controller import StudentController, AsyncStudentController
+from database.init_db import initialize_database, check_subject_summary, rebuild_subject_summary
+from database.db_connection import db
+from helpers.assets import DIST_DIR, build_assets, load_manifest, precompressed_variant
+from helpers.cache import student_cache
+from helpers.compression import compress_response
+from helpers.decorators import login_required
+from helpers.json_provider import create_json_provider
+from helpers.metrics import metrics
+from helpers.password_hasher import password_hasher
+from helpers.session_store import create_session_interface
+from helpers.utils import (iter_csv_records, iter_ndjson_records, iter_csv_chunks, iter_ndjson_chunks, make_etag,
+                           grading)
 
 # Create Flask application
 app = Flask(__name__)
 
 # Load configuration
-if os.environ.get('FLASK_ENV') == 'production':
-    app.config.from_object(ProductionConfig)
-else:
-    app.config.from_object(DevelopmentConfig)
+app.config.from_object(get_config())
+
+# orjson-backed JSON when available, with support for pre-encoded RawJSON values
+app.json = create_json_provider(app, app.config['JSON_PROVIDER'])
+
+# Keep session data server-side unless the signed-cookie backend is selected
+session_interface = create_session_interface(app.config['SESSION_BACKEND'])
+if session_interface is not None:
+    app.session_interface = session_interface
+
+# Initialize database once at startup rather than on a request
+def setup_database():
+    """Run schema migrations (and sample data in development) and time it"""
+    started = time.perf_counter()
+    # Startup is the only place the schema is set up, so a worker must not boot without it
+    if not initialize_database(with_sample_data=app.config['LOAD_SAMPLE_DATA']):
+        raise RuntimeError(f"Database initialization failed for {app.config['DATABASE_PATH']}")
+    app.config['DB_STARTUP_SECONDS'] = time.perf_counter() - started
+    app.logger.info('Database ready in %.3fs', app.config['DB_STARTUP_SECONDS'])
+
+@app.cli.command('init-db')
+@click.option('--sample-data/--no-sample-data', default=None,
+              help='Override LOAD_SAMPLE_DATA for this run.')
+def init_db_command(sample_data):
+    """Create or upgrade the database schema"""
+    if sample_data is None:
+        sample_data = app.config['LOAD_SAMPLE_DATA']
+    if not initialize_database(with_sample_data=sample_data):
+        raise click.ClickException('Database initialization failed')
+
+@app.cli.command('check-summary')
+@click.option('--rebuild', is_flag=True, help='Rebuild subject_summary if it has drifted.')
+def check_summary_command(rebuild):
+    """Verify the trigger-maintained subject_summary table against students"""
+    mismatches = check_subject_summary()
+    for mismatch in mismatches:
+        click.echo(f"Mismatch for teacher {mismatch['teacher_id']} / {mismatch['subject_name']}: "
+                   f"expected {mismatch['expected']}, found {mismatch['actual']}")
+    
+    if not mismatches:
+        click.echo('subject_summary is consistent.')
+    elif rebuild:
+        rebuild_subject_summary()
+        click.echo(f'Rebuilt subject_summary ({len(mismatches)} groups were out of date).')
+    else:
+        raise click.ClickException(f'{len(mismatches)} groups out of date; rerun with --rebuild')
+
+@app.cli.command('build-assets')
+def build_assets_command():
+    """Fingerprint and precompress static files into static/dist"""
+    manifest = build_assets(app.static_folder)
+    click.echo(f'Built {len(manifest)} assets into {app.static_folder}/{DIST_DIR}')
+
+if app.config['INIT_DB_ON_STARTUP']:
+    setup_database()
+
+# Fingerprinted static files from `flask build-assets`, if they have been built
+asset_manifest = load_manifest(app.static_folder)
+
+@app.url_defaults
+def fingerprint_static_urls(endpoint, values):
+    """Point url_for('static', ...) at the fingerprinted copy when one exists"""
+    if endpoint == 'static' and values.get('filename') in asset_manifest:
+        values['filename'] = asset_manifest[values['filename']]
+
+def send_static_asset(filename):
+    """Serve static files; fingerprinted ones get precompressed variants and immutable caching"""
+    if not filename.startswith(f'{DIST_DIR}/'):
+        return app.send_static_file(filename)
+    
+    variant, encoding = precompressed_variant(app.static_folder, filename, request.accept_encodings)
+    response = send_from_directory(
+        app.static_folder,
+        variant,
+        mimetype=mimetypes.guess_type(filename)[0],
+        max_age=app.config['ASSETS_MAX_AGE']
+    )
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+app.view_functions['static'] = send_static_asset
 
-# Initialize database on first run
 @app.before_request
-def ensure_tables_exist():
-    if not hasattr(app, 'db_initialized'):
-        initialize_database()
-        app.db_initialized = True
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request_timing(response):
+    """Record latency by URL rule; streamed bodies are timed up to the first byte"""
+    started = g.pop('request_started', None)
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule else '<unmatched>'
+        metrics.observe_request(request.method, route, response.status_code,
+                                time.perf_counter() - started)
+    return response
+
+@app.after_request
+def compress_api_response(response):
+    """gzip/brotli buffered responses above COMPRESSION_MIN_SIZE when the client accepts it"""
+    if app.config['COMPRESSION_ENABLED']:
+        compress_response(
+            response,
+            request.accept_encodings,
+            min_size=app.config['COMPRESSION_MIN_SIZE'],
+            level=app.config['COMPRESSION_LEVEL'],
+            mimetypes=app.config['COMPRESSION_MIMETYPES']
+        )
+    return response
+
+def conditional_response(response, etag):
+    """Attach a strong ETag and make browsers revalidate instead of reusing blindly"""
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    response.vary.add('Cookie')
+    return response
+
+def student_list_options():
+    """Paging, sorting and filter arguments for GET /api/students"""
+    return {
+        'limit': request.args.get('limit', type=int),
+        'cursor': request.args.get('cursor'),
+        'sort': request.args.get('sort', 'name'),
+        'order': request.args.get('order', 'asc'),
+        'subject': request.args.get('subject', '').strip() or None,
+        'name_prefix': request.args.get('name', '').strip() or None,
+        'min_marks': request.args.get('min_marks', type=int),
+        'max_marks': request.args.get('max_marks', type=int)
+    }
 
 # Routes
 @app.route('/')
@@ -37,11 +172,10 @@ def login():
     return render_template('login.html')
 
 @app.route('/dashboard')
+@login_required
 def dashboard():
     """Display teacher dashboard"""
-    if 'teacher_id' not in session:
-        return redirect(url_for('login'))
-    return render_template('dashboard.html', teacher=session.get('teacher'))
+    return render_template('dashboard.html', teacher=g.teacher)
 
 @app.route('/logout')
 def logout():
@@ -68,16 +202,21 @@ def api_login():
         auth_result = AuthController.authenticate_teacher(username, password)
         
         if auth_result['success']:
-            # Store user session
+            # Store only the teacher id; the profile is looked up (and cached) on demand
             teacher = auth_result['teacher']
+            session.clear()
+            if hasattr(session, 'regenerate'):
+                session.regenerate()
             session['teacher_id'] = teacher['id']
-            session['teacher'] = teacher
             
             return jsonify({
                 'success': True,
                 'message': 'Login successful',
                 'redirect_url': url_for('dashboard')
             })
+        elif auth_result.get('error_code') == 'busy':
+            # Shed load quickly rather than queueing more bcrypt work
+            return jsonify(auth_result), 429, {'Retry-After': '1'}
         else:
             return jsonify(auth_result), 401
             
@@ -88,18 +227,23 @@ def api_login():
         }), 500
 
 @app.route('/api/students', methods=['GET'])
+@login_required
 def api_get_students():
-    """Get all students for logged-in teacher"""
-    if 'teacher_id' not in session:
-        return jsonify({
-            'success': False,
-            'message': 'Not authenticated'
-        }), 401
-    
+    """Get a page of students for logged-in teacher, with optional filters and sorting"""
     try:
-        teacher_id = session['teacher_id']
-        result = StudentController.get_all_students(teacher_id)
-        return jsonify(result)
+        teacher_id = g.teacher_id
+        data_version = StudentController.get_data_version(teacher_id)
+        etag = make_etag(teacher_id, data_version, sorted(request.args.items(multi=True)))
+        if request.if_none_match.contains_weak(etag):
+            return conditional_response(Response(status=304), etag)
+        
+        result = StudentController.get_all_students(teacher_id, data_version=data_version, as_json=True,
+                                                   **student_list_options())
+        
+        if result['success']:
+            return conditional_response(jsonify(result), etag)
+        else:
+            return jsonify(result), 400
         
     except Exception as e:
         return jsonify({
@@ -108,28 +252,57 @@ def api_get_students():
         }), 500
 
 @app.route('/api/students', methods=['POST'])
+@login_required
 def api_add_student():
     """Add new student or update existing student"""
-    if 'teacher_id' not in session:
+    try:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({
+                'success': False,
+                'message': 'Request body must be a JSON object'
+            }), 400
+        
+        # Field rules live in STUDENT_SCHEMA; the controller validates and cleans
+        name = data.get('name')
+        subject_name = data.get('subject_name')
+        marks = data.get('marks')
+        
+        teacher_id = g.teacher_id
+        result = StudentController.add_or_update_student(name, subject_name, marks, teacher_id)
+        
+        if result['success']:
+            return jsonify(result)
+        else:
+            return jsonify(result), 400
+            
+    except Exception as e:
         return jsonify({
             'success': False,
-            'message': 'Not authenticated'
-        }), 401
-    
+            'message': f'Error adding student: {str(e)}'
+        }), 500
+
+@app.route('/api/students/bulk', methods=['POST'])
+@login_required
+def api_bulk_import_students():
+    """Stream a CSV or JSON-lines upload of marks into the students table"""
     try:
-        data = request.get_json()
-        name = data.get('name', '').strip()
-        subject_name = data.get('subject_name', '').strip()
-        marks = data.get('marks', '')
+        import_format = request.args.get('format')
+        if not import_format:
+            import_format = 'csv' if request.mimetype == 'text/csv' else 'ndjson'
         
-        if not name or not subject_name or not marks:
+        if import_format == 'csv':
+            records = iter_csv_records(request.stream)
+        elif import_format in ('ndjson', 'jsonl'):
+            records = iter_ndjson_records(request.stream)
+        else:
             return jsonify({
                 'success': False,
-                'message': 'All fields are required'
+                'message': 'Unsupported format. Use csv or ndjson'
             }), 400
         
-        teacher_id = session['teacher_id']
-        result = StudentController.add_or_update_student(name, subject_name, marks, teacher_id)
+        teacher_id = g.teacher_id
+        result = StudentController.bulk_import(records, teacher_id)
         
         if result['success']:
             return jsonify(result)
@@ -139,31 +312,146 @@ def api_add_student():
     except Exception as e:
         return jsonify({
             'success': False,
-            'message': f'Error adding student: {str(e)}'
+            'message': f'Error importing students: {str(e)}'
         }), 500
 
-@app.route('/api/students/<int:student_id>', methods=['PUT'])
-def api_update_student(student_id):
-    """Update existing student"""
-    if 'teacher_id' not in session:
+@app.route('/api/students/batch', methods=['POST'])
+@login_required
+def api_batch_students():
+    """Apply a list of create/update/delete operations in one transaction"""
+    try:
+        data = request.get_json(silent=True)
+        if isinstance(data, dict):
+            operations = data.get('operations')
+            atomic = data.get('atomic', False)
+        elif isinstance(data, list):
+            operations, atomic = data, False
+        else:
+            return jsonify({
+                'success': False,
+                'message': 'Request body must be a JSON list or object'
+            }), 400
+        
+        if not isinstance(atomic, bool):
+            return jsonify({
+                'success': False,
+                'message': 'atomic must be true or false'
+            }), 400
+        
+        teacher_id = g.teacher_id
+        result = StudentController.batch_operations(operations, teacher_id, atomic=atomic)
+        
+        if result['success']:
+            return jsonify(result)
+        else:
+            return jsonify(result), 400
+            
+    except Exception as e:
         return jsonify({
             'success': False,
-            'message': 'Not authenticated'
-        }), 401
-    
+            'message': f'Error applying batch: {str(e)}'
+        }), 500
+
+@app.route('/api/students/search', methods=['GET'])
+@login_required
+def api_search_students():
+    """Search the logged-in teacher's students by name or subject prefix"""
     try:
-        data = request.get_json()
-        name = data.get('name', '').strip()
-        subject_name = data.get('subject_name', '').strip()
-        marks = data.get('marks', '')
+        teacher_id = g.teacher_id
+        data_version = StudentController.get_data_version(teacher_id)
+        etag = make_etag(teacher_id, data_version, sorted(request.args.items(multi=True)))
+        if request.if_none_match.contains_weak(etag):
+            return conditional_response(Response(status=304), etag)
         
-        if not name or not subject_name or not marks:
+        result = StudentController.search_students(
+            teacher_id,
+            request.args.get('q', ''),
+            limit=request.args.get('limit', type=int),
+            data_version=data_version
+        )
+        
+        if result['success']:
+            return conditional_response(jsonify(result), etag)
+        else:
+            return jsonify(result), 400
+            
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Error searching students: {str(e)}'
+        }), 500
+
+@app.route('/api/students/stats', methods=['GET'])
+@login_required
+def api_student_stats():
+    """Get per-subject class performance statistics"""
+    try:
+        teacher_id = g.teacher_id
+        data_version = StudentController.get_data_version(teacher_id)
+        etag = make_etag(teacher_id, data_version, 'stats')
+        if request.if_none_match.contains_weak(etag):
+            return conditional_response(Response(status=304), etag)
+        
+        result = StudentController.get_statistics(teacher_id, data_version=data_version)
+        
+        if result['success']:
+            return conditional_response(jsonify(result), etag)
+        else:
+            return jsonify(result), 500
+            
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Error calculating statistics: {str(e)}'
+        }), 500
+
+@app.route('/api/students/export', methods=['GET'])
+@login_required
+def api_export_students():
+    """Stream all of the logged-in teacher's students as CSV or JSON lines (?grades=1 adds a grade column)"""
+    export_format = request.args.get('format', 'csv')
+    if export_format == 'csv':
+        serialize, mimetype = iter_csv_chunks, 'text/csv'
+    elif export_format in ('ndjson', 'jsonl'):
+        serialize, mimetype = iter_ndjson_chunks, 'application/x-ndjson'
+    else:
+        return jsonify({
+            'success': False,
+            'message': 'Unsupported format. Use csv or ndjson'
+        }), 400
+    
+    teacher_id = g.teacher_id
+    rows = StudentController.iter_students(teacher_id)
+    columns = ['id', 'name', 'subject_name', 'marks', 'created_at', 'updated_at']
+    if request.args.get('grades') == '1':
+        rows = grading.append_grades(rows, columns)
+        columns = columns + ['grade']
+    extension = 'csv' if export_format == 'csv' else 'ndjson'
+    
+    return Response(
+        stream_with_context(serialize(columns, rows)),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename=students.{extension}'}
+    )
+
+@app.route('/api/students/<int:student_id>', methods=['PUT'])
+@login_required
+def api_update_student(student_id):
+    """Update existing student"""
+    try:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
             return jsonify({
                 'success': False,
-                'message': 'All fields are required'
+                'message': 'Request body must be a JSON object'
             }), 400
         
-        teacher_id = session['teacher_id']
+        # Field rules live in STUDENT_SCHEMA; the controller validates and cleans
+        name = data.get('name')
+        subject_name = data.get('subject_name')
+        marks = data.get('marks')
+        
+        teacher_id = g.teacher_id
         result = StudentController.update_student(student_id, name, subject_name, marks, teacher_id)
         
         if result['success']:
@@ -178,16 +466,11 @@ def api_update_student(student_id):
         }), 500
 
 @app.route('/api/students/<int:student_id>', methods=['DELETE'])
+@login_required
 def api_delete_student(student_id):
     """Delete student"""
-    if 'teacher_id' not in session:
-        return jsonify({
-            'success': False,
-            'message': 'Not authenticated'
-        }), 401
-    
     try:
-        teacher_id = session['teacher_id']
+        teacher_id = g.teacher_id
         result = StudentController.delete_student(student_id, teacher_id)
         
         if result['success']:
@@ -202,17 +485,162 @@ def api_delete_student(student_id):
         }), 500
 
 @app.route('/api/students/<int:student_id>', methods=['GET'])
+@login_required
 def api_get_student(student_id):
     """Get specific student by ID"""
-    if 'teacher_id' not in session:
+    try:
+        teacher_id = g.teacher_id
+        data_version = StudentController.get_data_version(teacher_id)
+        etag = make_etag(teacher_id, data_version, student_id)
+        if request.if_none_match.contains_weak(etag):
+            return conditional_response(Response(status=304), etag)
+        
+        result = StudentController.get_student_by_id(student_id, teacher_id, data_version=data_version)
+        if result['success']:
+            return conditional_response(jsonify(result), etag)
+        return jsonify(result)
+        
+    except Exception as e:
         return jsonify({
             'success': False,
-            'message': 'Not authenticated'
-        }), 401
+            'message': f'Error fetching student: {str(e)}'
+        }), 500
+
+@app.route('/api/health/db', methods=['GET'])
+def api_db_health():
+    """Report database connection pool statistics"""
+    return jsonify({
+        'success': True,
+        'pool': db.get_pool_stats()
+    })
+
+@app.route('/api/health/cache', methods=['GET'])
+def api_cache_health():
+    """Report student cache statistics"""
+    return jsonify({
+        'success': True,
+        'cache': student_cache.stats()
+    })
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Expose request, query, pool, cache and hasher metrics in Prometheus text format"""
+    if not metrics.enabled:
+        return not_found(None)
     
+    body = metrics.render(gauges={
+        'db_pool': db.get_pool_stats(),
+        'student_cache': student_cache.stats(),
+        'teacher_cache': teacher_cache.stats(),
+        'password_hasher': password_hasher.stats()
+    })
+    return Response(body, content_type='text/plain; version=0.0.4; charset=utf-8')
+
+# Async variants of the read routes. With ASYNC_VIEWS enabled (requires asgiref)
+# they replace the synchronous views on the same URLs and offload database work
+# to async_db's threads.
+ASYNC_VIEWS = {}
+
+def async_view(endpoint):
+    """Register an async replacement for the view behind an endpoint"""
+    def register(view):
+        ASYNC_VIEWS[endpoint] = view
+        return view
+    return register
+
+@async_view('api_get_students')
+@login_required
+async def api_get_students_async():
+    """Async GET /api/students"""
     try:
-        teacher_id = session['teacher_id']
-        result = StudentController.get_student_by_id(student_id, teacher_id)
+        teacher_id = g.teacher_id
+        data_version = await AsyncStudentController.get_data_version(teacher_id)
+        etag = make_etag(teacher_id, data_version, sorted(request.args.items(multi=True)))
+        if request.if_none_match.contains_weak(etag):
+            return conditional_response(Response(status=304), etag)
+        
+        result = await AsyncStudentController.get_all_students(
+            teacher_id, data_version=data_version, as_json=True, **student_list_options()
+        )
+        
+        if result['success']:
+            return conditional_response(jsonify(result), etag)
+        else:
+            return jsonify(result), 400
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Error fetching students: {str(e)}'
+        }), 500
+
+@async_view('api_search_students')
+@login_required
+async def api_search_students_async():
+    """Async GET /api/students/search"""
+    try:
+        teacher_id = g.teacher_id
+        data_version = await AsyncStudentController.get_data_version(teacher_id)
+        etag = make_etag(teacher_id, data_version, sorted(request.args.items(multi=True)))
+        if request.if_none_match.contains_weak(etag):
+            return conditional_response(Response(status=304), etag)
+        
+        result = await AsyncStudentController.search_students(
+            teacher_id,
+            request.args.get('q', ''),
+            limit=request.args.get('limit', type=int),
+            data_version=data_version
+        )
+        
+        if result['success']:
+            return conditional_response(jsonify(result), etag)
+        else:
+            return jsonify(result), 400
+            
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Error searching students: {str(e)}'
+        }), 500
+
+@async_view('api_student_stats')
+@login_required
+async def api_student_stats_async():
+    """Async GET /api/students/stats"""
+    try:
+        teacher_id = g.teacher_id
+        data_version = await AsyncStudentController.get_data_version(teacher_id)
+        etag = make_etag(teacher_id, data_version, 'stats')
+        if request.if_none_match.contains_weak(etag):
+            return conditional_response(Response(status=304), etag)
+        
+        result = await AsyncStudentController.get_statistics(teacher_id, data_version=data_version)
+        
+        if result['success']:
+            return conditional_response(jsonify(result), etag)
+        else:
+            return jsonify(result), 500
+            
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Error calculating statistics: {str(e)}'
+        }), 500
+
+@async_view('api_get_student')
+@login_required
+async def api_get_student_async(student_id):
+    """Async GET /api/students/<id>"""
+    try:
+        teacher_id = g.teacher_id
+        data_version = await AsyncStudentController.get_data_version(teacher_id)
+        etag = make_etag(teacher_id, data_version, student_id)
+        if request.if_none_match.contains_weak(etag):
+            return conditional_response(Response(status=304), etag)
+        
+        result = await AsyncStudentController.get_student_by_id(student_id, teacher_id, data_version=data_version)
+        if result['success']:
+            return conditional_response(jsonify(result), etag)
         return jsonify(result)
         
     except Exception as e:
@@ -221,6 +649,18 @@ def api_get_student(student_id):
             'message': f'Error fetching student: {str(e)}'
         }), 500
 
+def use_async_views(enabled=True):
+    """Swap the read routes between their sync and async implementations"""
+    for endpoint, view in ASYNC_VIEWS.items():
+        if enabled:
+            app.view_functions[endpoint] = view
+        else:
+            app.view_functions[endpoint] = SYNC_VIEWS[endpoint]
+
+SYNC_VIEWS = {endpoint: app.view_functions[endpoint] for endpoint in ASYNC_VIEWS}
+if app.config['ASYNC_VIEWS']:
+    use_async_views()
+
 # Error handlers
 @app.errorhandler(404)
 def not_found(error):
@@ -0,0 +1,238 @@
+"""Load test for the student API: latency percentiles and throughput per endpoint.
+
+Seeds a throwaway database, logs one client in per worker thread and replays
+a weighted mix of list/add/update/delete (and optionally login) requests,
+either through the Flask test client or against a real threaded WSGI server.
+
+Run from the project root:
+
+    python -m benchmarks.bench_api --teachers 20 --students 2000 --concurrency 8
+    python -m benchmarks.bench_api --server --output baseline.json
+    python -m benchmarks.bench_api --server --compare baseline.json --max-regression 0.25
+
+With --compare the exit status is 1 when any endpoint's p95 is more than
+--max-regression slower than in the baseline file.
+"""
+import argparse
+import http.cookiejar
+import json
+import logging
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from benchmarks.common import SEED_PASSWORD, load_app, percentile, seed_database
+
+OPERATIONS = ('login', 'list', 'add', 'update', 'delete')
+LIST_SORTS = ('name', 'subject', 'marks', 'updated_at')
+
+class TestClientTransport:
+    """In-process requests through Flask's test client"""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, body=None):
+        response = self.client.open(path, method=method, json=body)
+        return response.status_code, response.get_json(silent=True)
+
+class HttpTransport:
+    """Real HTTP requests with a per-worker cookie jar"""
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar())
+        )
+
+    def request(self, method, path, body=None):
+        data = json.dumps(body).encode('utf-8') if body is not None else None
+        headers = {'Content-Type': 'application/json'} if data is not None else {}
+        req = urllib.request.Request(self.base_url + path, data=data, method=method, headers=headers)
+        try:
+            with self.opener.open(req, timeout=30) as response:
+                return response.status, json.loads(response.read() or b'null')
+        except urllib.error.HTTPError as e:
+            e.read()
+            return e.code, None
+
+def start_server(app):
+    """Serve the app from a threaded werkzeug server on a free port"""
+    from werkzeug.serving import make_server
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_port}'
+
+def parse_mix(text):
+    """Parse 'list=60,add=15,...' into operation weights"""
+    weights = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f'Unknown operation: {name}')
+        weights[name] = float(weight)
+    if not any(weights.values()):
+        raise argparse.ArgumentTypeError('At least one operation needs a positive weight')
+    return weights
+
+def run_worker(transport, username, worker_id, args, timings, errors):
+    """Log in, then send args.requests requests drawn from the mix"""
+    rng = random.Random(args.seed + worker_id)
+    names = list(args.mix)
+    weights = [args.mix[name] for name in names]
+    created = []
+    counter = 0
+
+    def timed(operation, method, path, body=None):
+        started = time.perf_counter()
+        status, payload = transport.request(method, path, body)
+        timings[operation].append(time.perf_counter() - started)
+        if status >= 400:
+            errors[operation] += 1
+        return payload
+
+    login = {'username': username, 'password': SEED_PASSWORD}
+    timed('login', 'POST', '/api/auth/login', login)
+
+    for _ in range(args.requests):
+        operation = rng.choices(names, weights)[0]
+        if operation in ('update', 'delete') and not created:
+            operation = 'add'
+
+        if operation == 'login':
+            timed('login', 'POST', '/api/auth/login', login)
+        elif operation == 'list':
+            timed('list', 'GET', f'/api/students?limit={args.page_size}&sort={rng.choice(LIST_SORTS)}')
+        elif operation == 'add':
+            counter += 1
+            payload = timed('add', 'POST', '/api/students', {
+                'name': f'Load {worker_id}-{counter}',
+                'subject_name': 'Mathematics',
+                'marks': rng.randint(1, 100)
+            })
+            if payload and payload.get('success'):
+                created.append((payload['student_id'], f'Load {worker_id}-{counter}'))
+        elif operation == 'update':
+            student_id, name = rng.choice(created)
+            timed('update', 'PUT', f'/api/students/{student_id}', {
+                'name': name,
+                'subject_name': 'Mathematics',
+                'marks': rng.randint(1, 100)
+            })
+        else:
+            student_id, _ = created.pop(rng.randrange(len(created)))
+            timed('delete', 'DELETE', f'/api/students/{student_id}')
+
+def summarize(timings, errors, elapsed):
+    """Per-operation count, errors, p50/p95/p99 (ms) and requests per second"""
+    results = {}
+    for operation in OPERATIONS:
+        samples = sorted(timings[operation])
+        if not samples:
+            continue
+        results[operation] = {
+            'count': len(samples),
+            'errors': errors[operation],
+            'p50_ms': percentile(samples, 50) * 1000,
+            'p95_ms': percentile(samples, 95) * 1000,
+            'p99_ms': percentile(samples, 99) * 1000,
+            'rps': len(samples) / elapsed
+        }
+    return results
+
+def compare(results, baseline, max_regression):
+    """Return the operations whose p95 regressed beyond the allowed ratio"""
+    regressions = []
+    for operation, current in results.items():
+        previous = baseline.get('endpoints', {}).get(operation)
+        if previous and current['p95_ms'] > previous['p95_ms'] * (1 + max_regression):
+            regressions.append((operation, previous['p95_ms'], current['p95_ms']))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--teachers', type=int, default=10)
+    parser.add_argument('--students', type=int, default=1000, help='students per teacher')
+    parser.add_argument('--concurrency', type=int, default=4, help='worker threads, one session each')
+    parser.add_argument('--requests', type=int, default=500, help='requests per worker after login')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix('list=60,add=15,update=15,delete=10'),
+                        help='operation weights, e.g. list=60,add=15,update=15,delete=10,login=1')
+    parser.add_argument('--page-size', type=int, default=50)
+    parser.add_argument('--server', action='store_true', help='go through a real threaded WSGI server')
+    parser.add_argument('--bcrypt-rounds', type=int, default=4,
+                        help='cost factor for the run; raise it to include realistic login cost')
+    parser.add_argument('--env', action='append', default=[], metavar='KEY=VALUE',
+                        help='extra configuration, e.g. --env CACHE_BACKEND=null')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help='write results as JSON')
+    parser.add_argument('--compare', help='baseline JSON written by --output')
+    parser.add_argument('--max-regression', type=float, default=0.25)
+    args = parser.parse_args()
+
+    environ = dict(item.split('=', 1) for item in args.env)
+    environ.setdefault('BCRYPT_ROUNDS', args.bcrypt_rounds)
+    environ.setdefault('BCRYPT_MAX_PENDING', max(8, args.concurrency))
+    environ.setdefault('DB_POOL_SIZE', max(5, args.concurrency))
+    app = load_app(**environ)
+
+    started = time.perf_counter()
+    usernames = seed_database(args.teachers, args.students)
+    print(f'Seeded {args.teachers} teachers x {args.students} students in {time.perf_counter() - started:.1f}s')
+
+    server = None
+    if args.server:
+        server, base_url = start_server(app)
+        make_transport = lambda: HttpTransport(base_url)
+    else:
+        make_transport = lambda: TestClientTransport(app)
+
+    worker_timings = [{operation: [] for operation in OPERATIONS} for _ in range(args.concurrency)]
+    worker_errors = [dict.fromkeys(OPERATIONS, 0) for _ in range(args.concurrency)]
+    threads = [
+        threading.Thread(target=run_worker, args=(
+            make_transport(), usernames[n % len(usernames)], n, args, worker_timings[n], worker_errors[n]
+        ))
+        for n in range(args.concurrency)
+    ]
+
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    if server is not None:
+        server.shutdown()
+
+    timings = {operation: [t for worker in worker_timings for t in worker[operation]] for operation in OPERATIONS}
+    errors = {operation: sum(worker[operation] for worker in worker_errors) for operation in OPERATIONS}
+    results = summarize(timings, errors, elapsed)
+    total = sum(result['count'] for result in results.values())
+
+    print(f"{'endpoint':<8} {'count':>7} {'errors':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'req/s':>8}")
+    for operation, result in results.items():
+        print(f"{operation:<8} {result['count']:>7} {result['errors']:>7} {result['p50_ms']:>8.2f} "
+              f"{result['p95_ms']:>8.2f} {result['p99_ms']:>8.2f} {result['rps']:>8.0f}")
+    print(f"{'total':<8} {total:>7} {sum(errors.values()):>7} {'':>8} {'':>8} {'':>8} {total / elapsed:>8.0f}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'args': {k: v for k, v in vars(args).items() if k not in ('output', 'compare')},
+                       'endpoints': results, 'throughput': total / elapsed}, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.max_regression)
+        for operation, before, after in regressions:
+            print(f'REGRESSION {operation}: p95 {before:.2f} ms -> {after:.2f} ms')
+        if regressions:
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""Concurrent read throughput: sync vs async database access and views.
+
+Two comparisons against the same seeded database:
+
+- controller: N threads calling StudentController vs N coroutines on one
+  event loop awaiting AsyncStudentController (the async_db thread pool)
+- http: N HTTP clients polling GET /api/students on a threaded WSGI server,
+  with the sync views vs the async views (ASYNC_VIEWS)
+
+The student cache is disabled by default so every poll reaches SQLite.
+
+Run from the project root:
+
+    python -m benchmarks.bench_async --concurrency 32 --requests 100
+"""
+import argparse
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from benchmarks.bench_api import HttpTransport, start_server
+from benchmarks.common import SEED_PASSWORD, load_app, percentile, seed_database
+
+def report(label, latencies, elapsed):
+    latencies.sort()
+    print(f'{label:<18} {len(latencies) / elapsed:>9.0f} {percentile(latencies, 50) * 1000:>9.2f} '
+          f'{percentile(latencies, 95) * 1000:>9.2f} {percentile(latencies, 99) * 1000:>9.2f}')
+
+def controller_sync(teacher_ids, args):
+    from controllers.student_controller import StudentController
+
+    def poll(worker):
+        latencies = []
+        teacher_id = teacher_ids[worker % len(teacher_ids)]
+        for _ in range(args.requests):
+            started = time.perf_counter()
+            StudentController.get_all_students(teacher_id, limit=args.page_size)
+            latencies.append(time.perf_counter() - started)
+        return latencies
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        results = list(executor.map(poll, range(args.concurrency)))
+    return [t for worker in results for t in worker], time.perf_counter() - started
+
+def controller_async(teacher_ids, args):
+    from controllers.student_controller import AsyncStudentController
+
+    async def poll(worker):
+        latencies = []
+        teacher_id = teacher_ids[worker % len(teacher_ids)]
+        for _ in range(args.requests):
+            started = time.perf_counter()
+            await AsyncStudentController.get_all_students(teacher_id, limit=args.page_size)
+            latencies.append(time.perf_counter() - started)
+        return latencies
+
+    async def run():
+        return await asyncio.gather(*(poll(worker) for worker in range(args.concurrency)))
+
+    started = time.perf_counter()
+    results = asyncio.run(run())
+    return [t for worker in results for t in worker], time.perf_counter() - started
+
+def http_polls(base_url, usernames, args):
+    latencies = []
+    lock = threading.Lock()
+
+    def poll(worker):
+        transport = HttpTransport(base_url)
+        transport.request('POST', '/api/auth/login',
+                          {'username': usernames[worker % len(usernames)], 'password': SEED_PASSWORD})
+        samples = []
+        for _ in range(args.requests):
+            started = time.perf_counter()
+            status, _ = transport.request('GET', f'/api/students?limit={args.page_size}')
+            if status != 200:
+                raise RuntimeError(f'Poll failed with HTTP {status}')
+            samples.append(time.perf_counter() - started)
+        with lock:
+            latencies.extend(samples)
+
+    threads = [threading.Thread(target=poll, args=(n,)) for n in range(args.concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--teachers', type=int, default=10)
+    parser.add_argument('--students', type=int, default=2000, help='students per teacher')
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=100, help='polls per client')
+    parser.add_argument('--page-size', type=int, default=50)
+    parser.add_argument('--pool-size', type=int, default=8)
+    parser.add_argument('--cache', default='null', help='CACHE_BACKEND for the run')
+    parser.add_argument('--skip-http', action='store_true')
+    args = parser.parse_args()
+
+    app = load_app(BCRYPT_ROUNDS=4, BCRYPT_MAX_PENDING=args.concurrency,
+                   DB_POOL_SIZE=args.pool_size, CACHE_BACKEND=args.cache, SLOW_QUERY_MS=1000)
+    import app as app_module
+    from database.db_connection import db
+
+    usernames = seed_database(args.teachers, args.students)
+    teacher_ids = [row['id'] for row in db.execute_query(
+        "SELECT id FROM teachers WHERE username LIKE 'bench%' ORDER BY id"
+    )]
+
+    print(f'{args.concurrency} concurrent clients x {args.requests} polls, pool size {args.pool_size}')
+    print(f"{'variant':<18} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    report('controller sync', *controller_sync(teacher_ids, args))
+    report('controller async', *controller_async(teacher_ids, args))
+
+    if not args.skip_http:
+        server, base_url = start_server(app)
+        app_module.use_async_views(False)
+        report('http sync views', *http_polls(base_url, usernames, args))
+        app_module.use_async_views(True)
+        report('http async views', *http_polls(base_url, usernames, args))
+        server.shutdown()
+
+if __name__ == '__main__':
+    main()
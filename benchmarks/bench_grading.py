@@ -0,0 +1,93 @@
+"""Grading throughput: the old if/elif functions vs compiled lookup tables and grade_many.
+
+Also times the stats grade distribution: the old SQL CASE over the boundaries
+vs counting per distinct mark and grading those counts in Python.
+
+Run from the project root:
+
+    python -m benchmarks.bench_grading --marks 1000000 --students 50000
+"""
+import argparse
+import random
+import time
+from benchmarks.common import load_app, seed_database
+
+LEGACY_BOUNDARIES = [(90, 'A+'), (80, 'A'), (70, 'B+'), (60, 'B'), (50, 'C'), (40, 'D'), (0, 'F')]
+
+def legacy_calculate_grade(marks):
+    for minimum, grade in LEGACY_BOUNDARIES:
+        if marks >= minimum:
+            return grade
+    return 'F'
+
+def legacy_get_grade_color(marks):
+    if marks >= 80:
+        return '#28a745'
+    elif marks >= 60:
+        return '#ffc107'
+    elif marks >= 40:
+        return '#fd7e14'
+    else:
+        return '#dc3545'
+
+def best_of(func, repeat=3):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--marks', type=int, default=1000000)
+    parser.add_argument('--students', type=int, default=50000, help='students for the stats query comparison')
+    args = parser.parse_args()
+
+    load_app(CACHE_BACKEND='null', BCRYPT_ROUNDS=4)
+    from database.db_connection import db
+    from helpers.utils import calculate_grade, get_grade_color, grading
+
+    rng = random.Random(1)
+    marks = [rng.randint(0, 100) for _ in range(args.marks)]
+    scheme = grading.for_subject(None)
+
+    variants = [
+        ('legacy calculate_grade', lambda: [legacy_calculate_grade(m) for m in marks]),
+        ('calculate_grade', lambda: [calculate_grade(m) for m in marks]),
+        ('scheme.grade', lambda: [scheme.grade(m) for m in marks]),
+        ('scheme.grade_many', lambda: scheme.grade_many(marks)),
+        ('legacy get_grade_color', lambda: [legacy_get_grade_color(m) for m in marks]),
+        ('get_grade_color', lambda: [get_grade_color(m) for m in marks]),
+    ]
+
+    print(f"{'variant':<24} {'ms':>9} {'ns/mark':>9}")
+    for label, func in variants:
+        elapsed = best_of(func)
+        print(f'{label:<24} {elapsed * 1000:>9.1f} {elapsed / len(marks) * 1e9:>9.1f}')
+
+    seed_database(1, args.students)
+    teacher_id = db.execute_query("SELECT id FROM teachers WHERE username = 'bench1'")[0]['id']
+
+    grade_case = ' '.join('WHEN marks >= ? THEN ?' for _ in LEGACY_BOUNDARIES)
+    case_query = f"""
+    SELECT subject_name, CASE {grade_case} ELSE 'F' END AS grade, COUNT(*) AS count
+    FROM students WHERE teacher_id = ? GROUP BY subject_name, grade
+    """
+    case_params = [value for boundary in LEGACY_BOUNDARIES for value in boundary] + [teacher_id]
+
+    def grouped_marks():
+        marks_counts = {}
+        for row in db.execute_query(
+            "SELECT subject_name, marks, COUNT(*) AS count FROM students WHERE teacher_id = ? GROUP BY subject_name, marks",
+            (teacher_id,)
+        ):
+            marks_counts.setdefault(row['subject_name'], []).append((row['marks'], row['count']))
+        return {name: grading.for_subject(name).grade_distribution(counts) for name, counts in marks_counts.items()}
+
+    print(f'\nGrade distribution over {args.students} students')
+    print(f"{'SQL CASE':<24} {best_of(lambda: db.execute_query(case_query, case_params)) * 1000:>9.1f} ms")
+    print(f"{'GROUP BY marks + table':<24} {best_of(grouped_marks) * 1000:>9.1f} ms")
+
+if __name__ == '__main__':
+    main()
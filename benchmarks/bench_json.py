@@ -0,0 +1,55 @@
+"""Serialising a 10k-row student list: stdlib vs orjson provider, dict rows vs the compact path.
+
+Each variant runs StudentController.get_all_students (cache disabled) and
+renders the JSON response body, the same work GET /api/students does.
+
+Run from the project root:
+
+    python -m benchmarks.bench_json --rows 10000 --repeat 20
+"""
+import argparse
+import time
+from benchmarks.common import load_app, seed_database
+
+def measure(provider, teacher_id, rows, as_json, repeat):
+    """Best-of-repeat milliseconds and body size for one variant"""
+    from controllers.student_controller import StudentController
+
+    provider.compact = True
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = StudentController.get_all_students(teacher_id, limit=rows, as_json=as_json)
+        body = provider.response(result).get_data()
+        timings.append(time.perf_counter() - started)
+    if not result['success']:
+        raise RuntimeError(result['message'])
+    return min(timings) * 1000, len(body)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    app = load_app(CACHE_BACKEND='null', BCRYPT_ROUNDS=4)
+    from config import get_config
+    from database.db_connection import db
+    from helpers.json_provider import JSON_PROVIDERS, orjson
+
+    get_config().STUDENTS_MAX_PAGE_SIZE = args.rows
+    seed_database(1, args.rows)
+    teacher_id = db.execute_query("SELECT id FROM teachers WHERE username = 'bench1'")[0]['id']
+
+    print(f"{'provider':<8} {'path':<8} {'ms':>8} {'bytes':>10}")
+    for name, provider_class in JSON_PROVIDERS.items():
+        if name == 'orjson' and orjson is None:
+            print('orjson   (not installed)')
+            continue
+        provider = provider_class(app)
+        for label, as_json in (('dict', False), ('compact', True)):
+            elapsed, size = measure(provider, teacher_id, args.rows, as_json, args.repeat)
+            print(f'{name:<8} {label:<8} {elapsed:>8.2f} {size:>10}')
+
+if __name__ == '__main__':
+    main()
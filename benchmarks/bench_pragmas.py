@@ -0,0 +1,130 @@
+"""Mixed read/write throughput with SQLite defaults vs the configured PRAGMA profile.
+
+Each profile runs twice: with one shared read-write pool, and with read-only
+pooled readers plus the single locked writer (DB_READ_WRITE_SPLIT).
+
+Run from the project root:
+
+    python -m benchmarks.bench_pragmas --readers 8 --writers 2 --seconds 5
+"""
+import argparse
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from config import DevelopmentConfig, ProductionConfig
+from database.db_connection import DatabaseConnection
+
+SCHEMA = """
+CREATE TABLE students (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name VARCHAR(100) NOT NULL,
+    subject_name VARCHAR(100) NOT NULL,
+    marks INTEGER NOT NULL,
+    teacher_id INTEGER NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(name, subject_name, teacher_id)
+)
+"""
+
+READ_QUERY = """
+SELECT id, name, subject_name, marks, created_at, updated_at
+FROM students
+WHERE teacher_id = ?
+ORDER BY name, subject_name
+"""
+
+WRITE_QUERY = """
+UPDATE students
+SET marks = marks + 1, updated_at = CURRENT_TIMESTAMP
+WHERE teacher_id = ? AND name = ?
+"""
+
+PROFILES = {
+    'defaults': {},
+    'development': DevelopmentConfig.SQLITE_PRAGMAS,
+    'production': ProductionConfig.SQLITE_PRAGMAS
+}
+
+def seed(db, teachers, students_per_teacher):
+    """Populate the students table"""
+    db.execute_update(SCHEMA)
+    with db.get_connection() as conn:
+        conn.executemany(
+            "INSERT INTO students (name, subject_name, marks, teacher_id) VALUES (?, ?, ?, ?)",
+            [
+                (f'Student {i}', 'Mathematics', i % 100, teacher_id)
+                for teacher_id in range(1, teachers + 1)
+                for i in range(students_per_teacher)
+            ]
+        )
+        conn.commit()
+
+def run_profile(name, pragmas, read_write_split, args):
+    """Run the mixed workload against a fresh database and return counters"""
+    workdir = tempfile.mkdtemp()
+    try:
+        db = DatabaseConnection(
+            os.path.join(workdir, 'bench.db'),
+            pool_size=args.readers + args.writers,
+            pragmas=pragmas,
+            read_write_split=read_write_split
+        )
+        seed(db, args.teachers, args.students)
+
+        counts = {'reads': 0, 'writes': 0, 'errors': 0}
+        lock = threading.Lock()
+        deadline = time.perf_counter() + args.seconds
+
+        def worker(is_writer, seed_value):
+            done = errors = 0
+            i = seed_value
+            while time.perf_counter() < deadline:
+                teacher_id = i % args.teachers + 1
+                try:
+                    if is_writer:
+                        db.execute_update(WRITE_QUERY, (teacher_id, f'Student {i % args.students}'))
+                    else:
+                        db.execute_query(READ_QUERY, (teacher_id,))
+                    done += 1
+                except sqlite3.OperationalError:
+                    errors += 1
+                i += 1
+            with lock:
+                counts['writes' if is_writer else 'reads'] += done
+                counts['errors'] += errors
+
+        threads = [threading.Thread(target=worker, args=(False, n)) for n in range(args.readers)]
+        threads += [threading.Thread(target=worker, args=(True, n)) for n in range(args.writers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        db.close()
+        return counts
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--teachers', type=int, default=10)
+    parser.add_argument('--students', type=int, default=500, help='students per teacher')
+    args = parser.parse_args()
+
+    print(f"{'profile':<12} {'routing':<8} {'reads/s':>10} {'writes/s':>10} {'errors':>8}")
+    for name, pragmas in PROFILES.items():
+        for read_write_split in (False, True):
+            counts = run_profile(name, pragmas, read_write_split, args)
+            print(f"{name:<12} {'split' if read_write_split else 'shared':<8} "
+                  f"{counts['reads'] / args.seconds:>10.0f} "
+                  f"{counts['writes'] / args.seconds:>10.0f} {counts['errors']:>8}")
+
+if __name__ == '__main__':
+    main()
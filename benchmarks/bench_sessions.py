@@ -0,0 +1,48 @@
+"""Per-request session overhead: fat signed cookie vs server-side session backends.
+
+Run from the project root:
+
+    python -m benchmarks.bench_sessions --requests 5000
+"""
+import argparse
+import time
+from benchmarks.common import load_app, login
+
+def measure(app, backend, requests):
+    """Average time for an authenticated request that is answered with 304"""
+    from helpers.session_store import create_session_interface
+    from flask.sessions import SecureCookieSessionInterface
+
+    app.session_interface = create_session_interface(backend) or SecureCookieSessionInterface()
+    client = login(app.test_client())
+
+    if backend == 'cookie':
+        # Reproduce the old behaviour of carrying the whole teacher dict in the cookie
+        from controllers.auth_controller import AuthController
+        with client.session_transaction() as sess:
+            sess['teacher'] = AuthController.get_teacher_by_id(sess['teacher_id'])['teacher']
+
+    cookie_size = len(client.get_cookie('session').value)
+    etag = client.get('/api/students/1').headers['ETag']
+
+    started = time.perf_counter()
+    for _ in range(requests):
+        client.get('/api/students/1', headers={'If-None-Match': etag})
+    elapsed = time.perf_counter() - started
+
+    return cookie_size, elapsed / requests * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=5000)
+    args = parser.parse_args()
+
+    app = load_app()
+
+    print(f"{'backend':<10} {'cookie bytes':>12} {'us/request':>12}")
+    for backend in ('cookie', 'memory', 'sqlite'):
+        cookie_size, per_request = measure(app, backend, args.requests)
+        print(f'{backend:<10} {cookie_size:>12} {per_request:>12.1f}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""Validating student rows: the old per-call validate_student_data vs STUDENT_SCHEMA.
+
+Run from the project root:
+
+    python -m benchmarks.bench_validation --rows 10000
+"""
+import argparse
+import random
+import time
+from helpers.validation import STUDENT_SCHEMA
+
+def legacy_validate_student_data(name, subject_name, marks):
+    errors = []
+    if not name or not name.strip():
+        errors.append("Student name is required")
+    elif len(name.strip()) < 2:
+        errors.append("Student name must be at least 2 characters long")
+    elif len(name.strip()) > 100:
+        errors.append("Student name must be less than 100 characters")
+    if not subject_name or not subject_name.strip():
+        errors.append("Subject name is required")
+    elif len(subject_name.strip()) < 2:
+        errors.append("Subject name must be at least 2 characters long")
+    elif len(subject_name.strip()) > 100:
+        errors.append("Subject name must be less than 100 characters")
+    try:
+        marks_int = int(marks)
+        if marks_int < 0:
+            errors.append("Marks cannot be negative")
+        elif marks_int > 1000:
+            errors.append("Marks cannot exceed 1000")
+    except (ValueError, TypeError):
+        errors.append("Marks must be a valid number")
+    if errors:
+        return {'valid': False, 'message': '; '.join(errors)}
+    return {'valid': True, 'message': 'Valid data'}
+
+def legacy_batch(records):
+    """What the bulk path did per row: strip in the caller, validate, convert marks again"""
+    valid = []
+    for record in records:
+        name = str(record.get('name') or '').strip()
+        subject_name = str(record.get('subject_name') or '').strip()
+        marks = record.get('marks')
+        if legacy_validate_student_data(name, subject_name, marks)['valid']:
+            valid.append((name, subject_name, int(marks)))
+    return valid
+
+def best_of(func, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--invalid', type=float, default=0.1, help='fraction of rows with a bad field')
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    records = []
+    for i in range(args.rows):
+        record = {'name': f' Student {i} ', 'subject_name': 'Mathematics', 'marks': str(rng.randint(0, 100))}
+        if rng.random() < args.invalid:
+            record[rng.choice(('name', 'marks'))] = ''
+        records.append(record)
+
+    variants = [
+        ('legacy per row', lambda: legacy_batch(records)),
+        ('schema.check per row', lambda: [STUDENT_SCHEMA.check(record) for record in records]),
+    ]
+
+    print(f"{'variant':<22} {'ms':>9} {'us/row':>9}")
+    for label, func in variants:
+        elapsed = best_of(func)
+        print(f'{label:<22} {elapsed * 1000:>9.2f} {elapsed / len(records) * 1e6:>9.2f}')
+
+if __name__ == '__main__':
+    main()
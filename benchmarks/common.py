@@ -0,0 +1,68 @@
+"""Shared helpers for benchmarks that drive the Flask app against a throwaway database."""
+import atexit
+import os
+import shutil
+import tempfile
+
+SAMPLE_USERNAME = 'teacher1'
+SAMPLE_PASSWORD = 'teacher123'
+
+SEED_PASSWORD = 'bench-password'
+SEED_SUBJECTS = ('Mathematics', 'Physics', 'Chemistry', 'Biology', 'History', 'English')
+
+def load_app(**environ):
+    """Import the Flask app bound to a temporary database.
+
+    Must run before anything imports ``database.db_connection``, because the
+    global ``db`` reads DATABASE_PATH when it is created. Extra keyword
+    arguments are exported as environment variables (e.g. SESSION_BACKEND).
+    """
+    workdir = tempfile.mkdtemp(prefix='teacher-portal-bench-')
+    atexit.register(shutil.rmtree, workdir, True)
+    os.environ['DATABASE_PATH'] = os.path.join(workdir, 'bench.db')
+    os.environ.setdefault('INIT_DB_ON_STARTUP', '1')
+    for key, value in environ.items():
+        os.environ[key] = str(value)
+
+    from app import app
+    return app
+
+def seed_database(teachers, students_per_teacher):
+    """Insert benchmark teachers (all sharing SEED_PASSWORD) with their students.
+
+    Call after load_app(). Returns the seeded usernames. The password is hashed
+    once, so seeding cost does not grow with BCRYPT_ROUNDS.
+    """
+    from database.db_connection import db
+    from helpers.password_hasher import password_hasher
+
+    password_hash = password_hasher.hash(SEED_PASSWORD)
+    usernames = [f'bench{n}' for n in range(1, teachers + 1)]
+    with db.transaction() as conn:
+        for username in usernames:
+            teacher_id = conn.execute(
+                "INSERT INTO teachers (username, email, password_hash, full_name) VALUES (?, ?, ?, ?)",
+                (username, f'{username}@example.com', password_hash, f'Bench Teacher {username[5:]}')
+            ).lastrowid
+            conn.executemany(
+                "INSERT INTO students (name, subject_name, marks, teacher_id) VALUES (?, ?, ?, ?)",
+                (
+                    (f'Student {i:06d}', SEED_SUBJECTS[i % len(SEED_SUBJECTS)], (i * 37) % 101, teacher_id)
+                    for i in range(students_per_teacher)
+                )
+            )
+    return usernames
+
+def login(client, username=SAMPLE_USERNAME, password=SAMPLE_PASSWORD):
+    """Log a test client in and fail loudly if it does not work"""
+    response = client.post('/api/auth/login', json={'username': username, 'password': password})
+    if response.status_code != 200:
+        raise RuntimeError(f'Login failed ({response.status_code}): {response.get_data(as_text=True)}')
+    return client
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
@@ -5,17 +5,129 @@ load_dotenv()
 
 class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
-    DATABASE_PATH = os.path.join(os.path.dirname(__file__), 'database', 'teacher_portal.db')
+    DATABASE_PATH = os.environ.get('DATABASE_PATH') or os.path.join(os.path.dirname(__file__), 'database', 'teacher_portal.db')
     TESTING = False
     DEBUG = True
 
+    # Connection pool sizing (per process; size it to the worker's thread count)
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 5))
+    DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 10.0))
+    DB_POOL_HEALTH_CHECK = True
+    # Idle seconds after which a pooled connection is checked before reuse
+    DB_POOL_IDLE_CHECK_SECONDS = float(os.environ.get('DB_POOL_IDLE_CHECK_SECONDS', 60.0))
+    # Pool connections are read-only and writes go through one locked writer connection
+    DB_READ_WRITE_SPLIT = os.environ.get('DB_READ_WRITE_SPLIT', '1') != '0'
+
+    # PRAGMAs applied once to every new pooled connection
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -8000,        # negative values are KiB, so ~8 MB
+        'mmap_size': 0,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000        # milliseconds
+    }
+
+    # Schema setup runs once per process at startup; sample data is for development only
+    INIT_DB_ON_STARTUP = os.environ.get('INIT_DB_ON_STARTUP', '1') != '0'
+    LOAD_SAMPLE_DATA = True
+
+    # GET /api/students pagination
+    STUDENTS_PAGE_SIZE = 100
+    STUDENTS_MAX_PAGE_SIZE = 500
+
+    # POST /api/students/bulk
+    BULK_IMPORT_BATCH_SIZE = 1000
+    BULK_IMPORT_MAX_ERRORS = 1000
+    # Validated rows are spooled in memory up to this many bytes, then to a temp file
+    BULK_IMPORT_SPOOL_MEMORY = 1024 * 1024
+
+    # POST /api/students/batch
+    BATCH_MAX_OPERATIONS = 500
+
+    # GET /api/students/export
+    EXPORT_FETCH_SIZE = 500
+
+    # bcrypt cost factor and the bounded pool that runs it
+    BCRYPT_ROUNDS = int(os.environ.get('BCRYPT_ROUNDS', 12))
+    BCRYPT_WORKERS = int(os.environ.get('BCRYPT_WORKERS', 2))
+    BCRYPT_MAX_PENDING = int(os.environ.get('BCRYPT_MAX_PENDING', 8))
+    BCRYPT_TIMEOUT = 5.0
+
+    # Per-teacher cache for student listings ('memory' or 'null').
+    # Each worker process has its own cache, so keep the TTL short.
+    CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'memory')
+    CACHE_TTL = 30
+    CACHE_MAX_ENTRIES = 2000
+    CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+    # GET /api/students/stats
+    STATS_PERCENTILES = (25, 50, 75, 90)
+    STATS_TOP_N = 3
+
+    # Grading: (minimum percentage of max marks, value) pairs, highest first, ending at 0.
+    # SUBJECT_GRADING overrides any of max_marks / boundaries / colors per subject,
+    # e.g. {'Physics': {'max_marks': 50}}.
+    GRADE_BOUNDARIES = ((90, 'A+'), (80, 'A'), (70, 'B+'), (60, 'B'), (50, 'C'), (40, 'D'), (0, 'F'))
+    GRADE_COLORS = ((80, '#28a745'), (60, '#ffc107'), (40, '#fd7e14'), (0, '#dc3545'))
+    GRADE_MAX_MARKS = 100
+    SUBJECT_GRADING = {}
+
+    # GET /api/students/search
+    SEARCH_DEFAULT_LIMIT = 20
+    SEARCH_MAX_LIMIT = 100
+
+    # Sessions: 'sqlite' or 'memory' keep data server-side behind an opaque cookie id,
+    # 'cookie' uses Flask's signed cookie. 'memory' is per-process, so single worker only.
+    SESSION_BACKEND = os.environ.get('SESSION_BACKEND', 'sqlite')
+    SESSION_TTL = 8 * 60 * 60
+    TEACHER_CACHE_TTL = 30
+
+    # Response compression for buffered responses (streamed exports are left alone).
+    # br is used when the optional brotli package is installed.
+    COMPRESSION_ENABLED = os.environ.get('COMPRESSION_ENABLED', '1') != '0'
+    COMPRESSION_MIN_SIZE = 1024
+    COMPRESSION_LEVEL = 6
+    COMPRESSION_MIMETYPES = ('application/json', 'text/html', 'text/csv', 'application/x-ndjson')
+
+    # Cache lifetime for fingerprinted files built by `flask build-assets`
+    ASSETS_MAX_AGE = 365 * 24 * 60 * 60
+
+    # JSON encoder for API responses: 'auto' (orjson if installed), 'orjson' or 'stdlib'
+    JSON_PROVIDER = os.environ.get('JSON_PROVIDER', 'auto')
+
+    # Serve the read routes from async views (needs asgiref). Under a WSGI server each
+    # request still holds a worker thread; this mainly pays off behind an ASGI adapter.
+    ASYNC_VIEWS = os.environ.get('ASYNC_VIEWS', '0') == '1'
+
+    # Request/query timings exposed at GET /metrics; statements slower than
+    # SLOW_QUERY_MS are logged. Distinct query texts beyond the cap share one series.
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '1') != '0'
+    SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', 100))
+    METRICS_MAX_QUERY_SERIES = 200
+
 class ProductionConfig(Config):
     DEBUG = False
     SECRET_KEY = os.environ.get('SECRET_KEY')
+    LOAD_SAMPLE_DATA = False
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -64000,       # ~64 MB
+        'mmap_size': 268435456,     # 256 MB
+        'temp_store': 'MEMORY',
+        'busy_timeout': 10000
+    }
 
 class DevelopmentConfig(Config):
     DEBUG = True
 
 class TestingConfig(Config):
     TESTING = True
-    DATABASE_PATH = ':memory:'
\ No newline at end of file
+    DATABASE_PATH = ':memory:'
+
+def get_config():
+    """Return the configuration class selected by FLASK_ENV"""
+    if os.environ.get('FLASK_ENV') == 'production':
+        return ProductionConfig
+    return DevelopmentConfig
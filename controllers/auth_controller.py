@@ -1,7 +1,16 @@
-import bcrypt
+import logging
+import sqlite3
+from config import get_config
 from database.db_connection import db
+from helpers.cache import create_cache
+from helpers.password_hasher import password_hasher, HasherBusyError
 from helpers.utils import validate_email, validate_password
 
+logger = logging.getLogger(__name__)
+
+# Short-lived cache of teacher profiles looked up on authenticated requests
+teacher_cache = create_cache(ttl=get_config().TEACHER_CACHE_TTL)
+
 class AuthController:
     @staticmethod
     def authenticate_teacher(username, password):
@@ -24,8 +33,20 @@ class AuthController:
             
             teacher = dict(results[0])
             
-            # Verify password
-            if bcrypt.checkpw(password.encode('utf-8'), teacher['password_hash'].encode('utf-8')):
+            # Verify password on the bounded bcrypt pool
+            try:
+                password_valid = password_hasher.verify(password, teacher['password_hash'])
+            except HasherBusyError as e:
+                return {
+                    'success': False,
+                    'message': str(e),
+                    'error_code': 'busy'
+                }
+            
+            if password_valid:
+                if password_hasher.needs_rehash(teacher['password_hash']):
+                    AuthController._rehash_password(teacher['id'], password)
+                
                 # Remove password hash from returned data
                 del teacher['password_hash']
                 return {
@@ -45,6 +66,24 @@ class AuthController:
                 'message': f'Authentication error: {str(e)}'
             }
     
+    @staticmethod
+    def _rehash_password(teacher_id, password):
+        """Upgrade a stored hash to the configured cost factor after a successful login"""
+        try:
+            new_hash = password_hasher.hash(password)
+        except HasherBusyError:
+            # Not worth failing the login over; try again on the next one
+            return
+        
+        try:
+            db.execute_update(
+                "UPDATE teachers SET password_hash = ? WHERE id = ?",
+                (new_hash, teacher_id)
+            )
+        except sqlite3.Error as e:
+            # Same as above: the old hash still verifies, so the login stands
+            logger.warning('Could not rehash password for teacher %s: %s', teacher_id, e)
+    
     @staticmethod
     def register_teacher(username, email, password, full_name):
         """Register a new teacher (for future use)"""
@@ -77,7 +116,14 @@ class AuthController:
                 }
             
             # Hash password
-            hashed_password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
+            try:
+                hashed_password = password_hasher.hash(password)
+            except HasherBusyError as e:
+                return {
+                    'success': False,
+                    'message': str(e),
+                    'error_code': 'busy'
+                }
             
             # Insert new teacher
             insert_query = """
@@ -86,7 +132,7 @@ class AuthController:
             """
             
             teacher_id = db.execute_insert(insert_query, (
-                username, email, hashed_password.decode('utf-8'), full_name
+                username, email, hashed_password, full_name
             ))
             
             if teacher_id:
@@ -109,8 +155,12 @@ class AuthController:
     
     @staticmethod
     def get_teacher_by_id(teacher_id):
-        """Get teacher information by ID"""
+        """Get teacher information by ID (cached for TEACHER_CACHE_TTL seconds)"""
         try:
+            cached = teacher_cache.get(teacher_id, 'teacher')
+            if cached is not None:
+                return cached
+            
             query = """
             SELECT id, username, email, full_name, created_at
             FROM teachers 
@@ -120,14 +170,17 @@ class AuthController:
             results = db.execute_query(query, (teacher_id,))
             
             if results:
-                return {
+                result = {
                     'success': True,
                     'teacher': dict(results[0])
                 }
+                teacher_cache.set(teacher_id, 'teacher', result)
+                return result
             else:
                 return {
                     'success': False,
-                    'message': 'Teacher not found'
+                    'message': 'Teacher not found',
+                    'error_code': 'not_found'
                 }
                 
         except Exception as e:
@@ -1,26 +1,147 @@
-from database.db_connection import db
-from helpers.utils import validate_student_data
+import csv
+import itertools
+import tempfile
+from config import get_config
+from database.db_connection import db, async_db
+from helpers.cache import student_cache
+from helpers.json_provider import RawJSON
+from helpers.utils import encode_cursor, decode_cursor, grading, interpolate_percentile, build_fts_query
+from helpers.validation import STUDENT_SCHEMA, format_errors
+
+# Sortable columns, each followed by its tie-breakers; id always breaks the final tie
+SORT_KEYS = {
+    'name': ('name', 'subject_name'),
+    'subject': ('subject_name', 'name'),
+    'marks': ('marks',),
+    'updated_at': ('updated_at',)
+}
 
 class StudentController:
     @staticmethod
-    def get_all_students(teacher_id):
-        """Get all students for a specific teacher"""
+    def get_data_version(teacher_id):
+        """Get the teacher's data version, bumped by triggers on every student write"""
+        results = db.execute_query(
+            "SELECT version FROM teacher_data_versions WHERE teacher_id = ?",
+            (teacher_id,)
+        )
+        return results[0]['version'] if results else 0
+    
+    @staticmethod
+    def get_all_students(teacher_id, limit=None, cursor=None, sort='name', order='asc',
+                         subject=None, name_prefix=None, min_marks=None, max_marks=None,
+                         data_version=None, as_json=False):
+        """Get one page of students for a specific teacher using keyset pagination.
+        
+        With as_json=True, 'students' is a RawJSON array built by SQLite's json_object,
+        so no dict is created per row and the JSON provider splices it in verbatim.
+        """
         try:
-            query = """
-            SELECT id, name, subject_name, marks, created_at, updated_at
-            FROM students 
-            WHERE teacher_id = ?
-            ORDER BY name, subject_name
+            config = get_config()
+            
+            if data_version is None:
+                data_version = StudentController.get_data_version(teacher_id)
+            
+            if sort not in SORT_KEYS:
+                return {
+                    'success': False,
+                    'message': f'Invalid sort key. Use one of: {", ".join(SORT_KEYS)}'
+                }
+            
+            if order not in ('asc', 'desc'):
+                return {
+                    'success': False,
+                    'message': 'Invalid order. Use asc or desc'
+                }
+            
+            limit = limit or config.STUDENTS_PAGE_SIZE
+            limit = max(1, min(limit, config.STUDENTS_MAX_PAGE_SIZE))
+            
+            # Keying on the data version keeps other workers' writes from serving stale pages
+            cache_key = ('list', data_version, limit, cursor, sort, order,
+                         subject, name_prefix, min_marks, max_marks, as_json)
+            cached = student_cache.get(teacher_id, cache_key)
+            if cached is not None:
+                return cached
+            
+            columns = SORT_KEYS[sort] + ('id',)
+            
+            source = 'students'
+            conditions = ['teacher_id = ?']
+            params = [teacher_id]
+            
+            if subject:
+                conditions.append('subject_name = ?')
+                params.append(subject)
+            
+            if name_prefix:
+                # Case-insensitive half-open range instead of LIKE, on the
+                # (teacher_id, name COLLATE NOCASE) index. NOCASE folds ASCII to lower case,
+                # so the bounds are folded the same way first. The index is named because
+                # the planner otherwise walks the BINARY name index to avoid a sort.
+                prefix = ''.join(char.lower() if char.isascii() else char for char in name_prefix)
+                source = 'students INDEXED BY idx_students_teacher_name_nocase'
+                conditions.append('name >= ? COLLATE NOCASE AND name < ? COLLATE NOCASE')
+                params.extend([prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)])
+            
+            if min_marks is not None:
+                conditions.append('marks >= ?')
+                params.append(min_marks)
+            
+            if max_marks is not None:
+                conditions.append('marks <= ?')
+                params.append(max_marks)
+            
+            if cursor:
+                cursor_values = decode_cursor(cursor)
+                if cursor_values is None or len(cursor_values) != len(columns) + 2 \
+                        or cursor_values[:2] != [sort, order]:
+                    return {
+                        'success': False,
+                        'message': 'Invalid or expired cursor'
+                    }
+                
+                comparison = '>' if order == 'asc' else '<'
+                conditions.append(f'({", ".join(columns)}) {comparison} ({", ".join("?" * len(columns))})')
+                params.extend(cursor_values[2:])
+            
+            if as_json:
+                # The sort columns come along so the cursor can be built from the last row
+                select = f"""json_object('id', id, 'name', name, 'subject_name', subject_name, 'marks', marks,
+                                   'created_at', created_at, 'updated_at', updated_at) AS student_json,
+                       {', '.join(columns)}"""
+            else:
+                select = 'id, name, subject_name, marks, created_at, updated_at'
+            
+            direction = order.upper()
+            query = f"""
+            SELECT {select}
+            FROM {source}
+            WHERE {' AND '.join(conditions)}
+            ORDER BY {', '.join(f'{column} {direction}' for column in columns)}
+            LIMIT ?
             """
+            params.append(limit + 1)
+            
+            results = db.execute_query(query, params)
+            page = results[:limit]
             
-            results = db.execute_query(query, (teacher_id,))
+            if as_json:
+                students = RawJSON('[' + ','.join(row['student_json'] for row in page) + ']')
+            else:
+                students = [dict(row) for row in page]
             
-            students = [dict(row) for row in results]
+            next_cursor = None
+            if len(results) > limit:
+                last = page[-1]
+                next_cursor = encode_cursor([sort, order] + [last[column] for column in columns])
             
-            return {
+            result = {
                 'success': True,
-                'students': students
+                'students': students,
+                'next_cursor': next_cursor
             }
+            student_cache.set(teacher_id, cache_key, result)
+            return result
             
         except Exception as e:
             return {
@@ -29,138 +150,453 @@ class StudentController:
             }
     
     @staticmethod
-    def add_or_update_student(name, subject_name, marks, teacher_id):
-        """Add new student or update existing student's marks"""
+    def search_students(teacher_id, text, limit=None, data_version=None):
+        """Full-text prefix search over a teacher's student names and subjects, best match first"""
         try:
-            # Validate input data
-            validation_result = validate_student_data(name, subject_name, marks)
-            if not validation_result['valid']:
+            config = get_config()
+            
+            terms = build_fts_query(text)
+            if not terms:
                 return {
                     'success': False,
-                    'message': validation_result['message']
+                    'message': 'Search text is required'
                 }
             
-            # Check if student with same name and subject already exists
-            check_query = """
-            SELECT id, marks FROM students 
-            WHERE name = ? AND subject_name = ? AND teacher_id = ?
+            limit = limit or config.SEARCH_DEFAULT_LIMIT
+            limit = max(1, min(limit, config.SEARCH_MAX_LIMIT))
+            
+            if data_version is None:
+                data_version = StudentController.get_data_version(teacher_id)
+            
+            cache_key = ('search', data_version, terms, limit)
+            cached = student_cache.get(teacher_id, cache_key)
+            if cached is not None:
+                return cached
+            
+            query = """
+            SELECT s.id, s.name, s.subject_name, s.marks, s.created_at, s.updated_at
+            FROM students_fts
+            JOIN students s ON s.id = students_fts.rowid
+            WHERE students_fts MATCH ?
+            ORDER BY students_fts.rank
+            LIMIT ?
             """
+            match = f'teacher_id : "{int(teacher_id)}" AND {{name subject_name}} : ({terms})'
+            
+            results = db.execute_query(query, (match, limit))
             
-            existing = db.execute_query(check_query, (name, subject_name, teacher_id))
+            result = {
+                'success': True,
+                'students': [dict(row) for row in results]
+            }
+            student_cache.set(teacher_id, cache_key, result)
+            return result
+            
+        except Exception as e:
+            return {
+                'success': False,
+                'message': f'Error searching students: {str(e)}'
+            }
+    
+    @staticmethod
+    def get_statistics(teacher_id, data_version=None):
+        """Get per-subject count, mean, percentiles, grade distribution and top/bottom students"""
+        try:
+            config = get_config()
+            
+            if data_version is None:
+                data_version = StudentController.get_data_version(teacher_id)
+            
+            cache_key = ('stats', data_version)
+            cached = student_cache.get(teacher_id, cache_key)
+            if cached is not None:
+                return cached
+            
+            # Count, sum and extremes come from the trigger-maintained summary: O(subjects)
+            summary_query = """
+            SELECT subject_name, student_count, sum_marks, min_marks, max_marks
+            FROM subject_summary
+            WHERE teacher_id = ?
+            """
             
-            if existing:
-                # Update existing student - add new marks to existing marks
-                existing_student = dict(existing[0])
-                new_total_marks = existing_student['marks'] + int(marks)
+            # All reads share one snapshot, so a write committed mid-way cannot make the
+            # summary, the mark counts and the per-subject probes disagree
+            with db.read_snapshot() as conn:
+                snapshot_version = conn.execute(
+                    "SELECT version FROM teacher_data_versions WHERE teacher_id = ?",
+                    (teacher_id,)
+                ).fetchone()
+                snapshot_version = snapshot_version['version'] if snapshot_version else 0
+                
+                subjects = {}
+                for row in conn.execute(summary_query, (teacher_id,)):
+                    subjects[row['subject_name']] = {
+                        'count': row['student_count'],
+                        'total': row['sum_marks'],
+                        'min': row['min_marks'],
+                        'max': row['max_marks']
+                    }
                 
-                update_query = """
-                UPDATE students 
-                SET marks = ?, updated_at = CURRENT_TIMESTAMP
-                WHERE id = ?
+                # Grades depend on each subject's grading scheme, so SQLite only counts students
+                # per distinct mark (from the covering (teacher_id, subject_name, marks) index)
+                # and the compiled grade tables turn those counts into a distribution
+                marks_query = """
+                SELECT subject_name, marks, COUNT(*) AS count
+                FROM students
+                WHERE teacher_id = ?
+                GROUP BY subject_name, marks
                 """
                 
-                rows_updated = db.execute_update(update_query, (new_total_marks, existing_student['id']))
+                marks_counts = {}
+                for row in conn.execute(marks_query, (teacher_id,)):
+                    marks_counts.setdefault(row['subject_name'], []).append((row['marks'], row['count']))
                 
-                if rows_updated:
-                    return {
-                        'success': True,
-                        'message': f'Updated {name}\'s marks in {subject_name}. New total: {new_total_marks}',
-                        'action': 'updated',
-                        'student_id': existing_student['id'],
-                        'new_marks': new_total_marks
-                    }
-                else:
-                    return {
-                        'success': False,
-                        'message': 'Failed to update student marks'
-                    }
-            else:
-                # Create new student record
-                insert_query = """
-                INSERT INTO students (name, subject_name, marks, teacher_id)
-                VALUES (?, ?, ?, ?)
-                """
+                for name, subject in subjects.items():
+                    subject['grades'] = grading.for_subject(name).grade_distribution(marks_counts.get(name, ()))
                 
-                student_id = db.execute_insert(insert_query, (name, subject_name, int(marks), teacher_id))
+                # Per subject, walk the (teacher_id, subject_name, marks) index: percentile
+                # positions are LIMIT/OFFSET probes and top/bottom are short ordered scans
+                percentiles = config.STATS_PERCENTILES
+                top_n = config.STATS_TOP_N
+                ordered_marks = {}
+                rankings = {}
                 
-                if student_id:
-                    return {
-                        'success': True,
-                        'message': f'Added new student: {name} in {subject_name}',
-                        'action': 'created',
-                        'student_id': student_id
-                    }
-                else:
-                    return {
-                        'success': False,
-                        'message': 'Failed to create new student record'
+                for name, subject in subjects.items():
+                    count = subject['count']
+                    positions = sorted({
+                        offset
+                        for p in set(percentiles) | {50}
+                        for offset in (int((count - 1) * p / 100), int((count - 1) * p / 100) + 1)
+                        if offset < count
+                    })
+                
+                    percentile_query = ' UNION ALL '.join(
+                        """
+                        SELECT * FROM (
+                            SELECT ? AS pos, marks FROM students
+                            WHERE teacher_id = ? AND subject_name = ?
+                            ORDER BY marks, id LIMIT 1 OFFSET ?
+                        )
+                        """
+                        for _ in positions
+                    )
+                    percentile_params = [value for pos in positions for value in (pos, teacher_id, name, pos)]
+                    ordered_marks[name] = {
+                        row['pos']: row['marks']
+                        for row in conn.execute(percentile_query, percentile_params)
                     }
-                    
+                
+                    ranking_query = """
+                    SELECT * FROM (
+                        SELECT 'top' AS ranking, id, name, marks FROM students
+                        WHERE teacher_id = ? AND subject_name = ?
+                        ORDER BY marks DESC, id DESC LIMIT ?
+                    )
+                    UNION ALL
+                    SELECT * FROM (
+                        SELECT 'bottom' AS ranking, id, name, marks FROM students
+                        WHERE teacher_id = ? AND subject_name = ?
+                        ORDER BY marks ASC, id ASC LIMIT ?
+                    )
+                    """
+                    ranking = rankings[name] = {'top': [], 'bottom': []}
+                    for row in conn.execute(ranking_query, (teacher_id, name, top_n, teacher_id, name, top_n)):
+                        ranking[row['ranking']].append({'id': row['id'], 'name': row['name'], 'marks': row['marks']})
+            
+            results = []
+            for name in sorted(subjects):
+                subject = subjects[name]
+                count = subject['count']
+                ranking = rankings[name]
+                marks_at = ordered_marks[name]
+                results.append({
+                    'subject_name': name,
+                    'count': count,
+                    'mean': round(subject['total'] / count, 2),
+                    'median': interpolate_percentile(marks_at, count, 50),
+                    'min': subject['min'],
+                    'max': subject['max'],
+                    'percentiles': {
+                        f'p{p}': interpolate_percentile(marks_at, count, p) for p in percentiles
+                    },
+                    'grades': subject['grades'],
+                    'top_students': ranking['top'],
+                    'bottom_students': ranking['bottom']
+                })
+            
+            result = {
+                'success': True,
+                'total_students': sum(subject['count'] for subject in results),
+                'subjects': results
+            }
+            # Only cache under the version the caller keyed on if the snapshot saw that version
+            if snapshot_version == data_version:
+                student_cache.set(teacher_id, cache_key, result)
+            return result
+            
         except Exception as e:
             return {
                 'success': False,
-                'message': f'Error processing student: {str(e)}'
+                'message': f'Error calculating statistics: {str(e)}'
             }
     
     @staticmethod
-    def update_student(student_id, name, subject_name, marks, teacher_id):
-        """Update an existing student's information"""
+    def iter_students(teacher_id):
+        """Yield every student row for a teacher from a server-side cursor"""
+        query = """
+        SELECT id, name, subject_name, marks, created_at, updated_at
+        FROM students 
+        WHERE teacher_id = ?
+        ORDER BY name, subject_name, id
+        """
+        
+        return db.iter_query(query, (teacher_id,), batch_size=get_config().EXPORT_FETCH_SIZE)
+    
+    @staticmethod
+    def add_or_update_student(name, subject_name, marks, teacher_id):
+        """Add new student or update existing student's marks"""
         try:
             # Validate input data
-            validation_result = validate_student_data(name, subject_name, marks)
-            if not validation_result['valid']:
+            values, errors = STUDENT_SCHEMA.check_values(name, subject_name, marks)
+            if errors:
                 return {
                     'success': False,
-                    'message': validation_result['message']
+                    'message': format_errors(errors),
+                    'errors': errors
                 }
             
-            # Check if student exists and belongs to the teacher
-            check_query = """
-            SELECT id FROM students 
-            WHERE id = ? AND teacher_id = ?
-            """
-            
-            existing = db.execute_query(check_query, (student_id, teacher_id))
+            with db.transaction() as conn:
+                result = StudentController._upsert_student(conn, *values, teacher_id)
             
-            if not existing:
-                return {
-                    'success': False,
-                    'message': 'Student not found'
-                }
+            student_cache.invalidate(teacher_id)
+            return result
+                    
+        except Exception as e:
+            return {
+                'success': False,
+                'message': f'Error processing student: {str(e)}'
+            }
+    
+    @staticmethod
+    def bulk_import(records, teacher_id):
+        """Validate streamed (line_number, record) pairs, then upsert the valid ones in a single transaction.
+        
+        Valid rows are spooled to a temporary file while the upload is read, and the
+        write transaction only starts once the body has been fully received, so a
+        slow client never holds the writer lock. Memory use stays constant.
+        """
+        config = get_config()
+        batch_size = config.BULK_IMPORT_BATCH_SIZE
+        max_errors = config.BULK_IMPORT_MAX_ERRORS
+        
+        upsert_query = """
+        INSERT INTO students (name, subject_name, marks, teacher_id)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(name, subject_name, teacher_id) DO UPDATE SET
+            marks = students.marks + excluded.marks,
+            updated_at = CURRENT_TIMESTAMP
+        """
+        
+        processed = imported = failed = valid = 0
+        errors = []
+        check = STUDENT_SCHEMA.check
+        
+        def record_error(line_number, message, field_errors=None):
+            nonlocal failed
+            failed += 1
+            if len(errors) < max_errors:
+                error = {'line': line_number, 'message': message}
+                if field_errors:
+                    error['errors'] = field_errors
+                errors.append(error)
+        
+        try:
+            with tempfile.SpooledTemporaryFile(max_size=config.BULK_IMPORT_SPOOL_MEMORY, mode='w+',
+                                               newline='', encoding='utf-8') as spool:
+                writer = csv.writer(spool)
+                
+                for line_number, record in records:
+                    processed += 1
+                    
+                    if isinstance(record, str):
+                        record_error(line_number, record)
+                        continue
+                    
+                    values, field_errors = check(record)
+                    if field_errors:
+                        record_error(line_number, format_errors(field_errors), field_errors)
+                        continue
+                    
+                    writer.writerow(values)
+                    valid += 1
+                
+                if valid:
+                    spool.seek(0)
+                    rows = (
+                        (name, subject_name, int(marks), teacher_id)
+                        for name, subject_name, marks in csv.reader(spool)
+                    )
+                    
+                    with db.transaction() as conn:
+                        while True:
+                            batch = list(itertools.islice(rows, batch_size))
+                            if not batch:
+                                break
+                            conn.executemany(upsert_query, batch)
+                            imported += len(batch)
             
-            # Check for duplicate name-subject combination (excluding current student)
-            duplicate_query = """
-            SELECT id FROM students 
-            WHERE name = ? AND subject_name = ? AND teacher_id = ? AND id != ?
-            """
+            if imported:
+                student_cache.invalidate(teacher_id)
             
-            duplicate = db.execute_query(duplicate_query, (name, subject_name, teacher_id, student_id))
+            return {
+                'success': True,
+                'message': f'Imported {imported} of {processed} rows',
+                'processed': processed,
+                'imported': imported,
+                'failed': failed,
+                'errors': errors,
+                'errors_truncated': failed > len(errors)
+            }
             
-            if duplicate:
-                return {
-                    'success': False,
-                    'message': 'A student with this name and subject combination already exists'
-                }
+        except Exception as e:
+            return {
+                'success': False,
+                'message': f'Error importing students: {str(e)}',
+                'processed': processed
+            }
+    
+    @staticmethod
+    def batch_operations(operations, teacher_id, atomic=False):
+        """Apply create/update/delete operations on one connection in one transaction.
+        
+        Each operation runs under its own SAVEPOINT, so a failing operation is rolled
+        back on its own and reported in its result. With atomic=True the first
+        failure rolls back the whole batch instead.
+        """
+        max_operations = get_config().BATCH_MAX_OPERATIONS
+        if not isinstance(operations, list) or not operations:
+            return {
+                'success': False,
+                'message': 'operations must be a non-empty list'
+            }
+        if len(operations) > max_operations:
+            return {
+                'success': False,
+                'message': f'A batch may contain at most {max_operations} operations'
+            }
+        
+        results = []
+        applied = 0
+        
+        try:
+            with db.transaction() as conn:
+                for index, operation in enumerate(operations):
+                    values, result = StudentController._validate_batch_operation(operation)
+                    
+                    if result is None:
+                        conn.execute("SAVEPOINT batch_operation")
+                        try:
+                            result = StudentController._apply_batch_operation(conn, operation, values, teacher_id)
+                        except Exception as e:
+                            conn.execute("ROLLBACK TO batch_operation")
+                            result = {
+                                'success': False,
+                                'message': f'Error applying operation: {str(e)}'
+                            }
+                        conn.execute("RELEASE batch_operation")
+                    
+                    result = {'index': index, 'op': operation.get('op') if isinstance(operation, dict) else None, **result}
+                    results.append(result)
+                    
+                    if result['success']:
+                        applied += 1
+                    elif atomic:
+                        # Nothing is committed; transaction() finds no open transaction
+                        conn.rollback()
+                        return {
+                            'success': False,
+                            'message': f'Operation {index} failed, batch rolled back: {result["message"]}',
+                            'applied': 0,
+                            'failed': len(operations),
+                            'results': results
+                        }
             
-            # Update student
-            update_query = """
-            UPDATE students 
-            SET name = ?, subject_name = ?, marks = ?, updated_at = CURRENT_TIMESTAMP
-            WHERE id = ? AND teacher_id = ?
-            """
+            if applied:
+                student_cache.invalidate(teacher_id)
             
-            rows_updated = db.execute_update(update_query, (name, subject_name, int(marks), student_id, teacher_id))
+            return {
+                'success': True,
+                'message': f'Applied {applied} of {len(operations)} operations',
+                'applied': applied,
+                'failed': len(operations) - applied,
+                'results': results
+            }
             
-            if rows_updated:
-                return {
-                    'success': True,
-                    'message': 'Student updated successfully'
+        except Exception as e:
+            return {
+                'success': False,
+                'message': f'Error applying batch: {str(e)}'
+            }
+    
+    @staticmethod
+    def _validate_batch_operation(operation):
+        """Return (cleaned student values, None) for a runnable operation, or (None, error result)"""
+        if not isinstance(operation, dict) or operation.get('op') not in ('create', 'update', 'delete'):
+            return None, {
+                'success': False,
+                'message': 'op must be one of create, update or delete'
+            }
+        
+        if operation['op'] in ('update', 'delete'):
+            student_id = operation.get('id')
+            if isinstance(student_id, bool) or not isinstance(student_id, int):
+                return None, {
+                    'success': False,
+                    'message': 'id must be an integer',
+                    'errors': {'id': 'id must be an integer'}
                 }
-            else:
+        
+        if operation['op'] == 'delete':
+            return None, None
+        
+        values, errors = STUDENT_SCHEMA.check(operation)
+        if errors:
+            return None, {
+                'success': False,
+                'message': format_errors(errors),
+                'errors': errors
+            }
+        return values, None
+    
+    @staticmethod
+    def _apply_batch_operation(conn, operation, values, teacher_id):
+        """Run one validated batch operation on the batch's connection"""
+        op = operation['op']
+        if op == 'delete':
+            return StudentController._delete_student(conn, operation['id'], teacher_id)
+        if op == 'create':
+            return StudentController._upsert_student(conn, *values, teacher_id)
+        return StudentController._update_student(conn, operation['id'], *values, teacher_id)
+    
+    @staticmethod
+    def update_student(student_id, name, subject_name, marks, teacher_id):
+        """Update an existing student's information"""
+        try:
+            # Validate input data
+            values, errors = STUDENT_SCHEMA.check_values(name, subject_name, marks)
+            if errors:
                 return {
                     'success': False,
-                    'message': 'Failed to update student'
+                    'message': format_errors(errors),
+                    'errors': errors
                 }
+            
+            with db.transaction() as conn:
+                result = StudentController._update_student(conn, student_id, *values, teacher_id)
+            
+            if result['success']:
+                student_cache.invalidate(teacher_id)
+            return result
                 
         except Exception as e:
             return {
@@ -172,40 +608,12 @@ class StudentController:
     def delete_student(student_id, teacher_id):
         """Delete a student record"""
         try:
-            # Check if student exists and belongs to the teacher
-            check_query = """
-            SELECT id, name, subject_name FROM students 
-            WHERE id = ? AND teacher_id = ?
-            """
-            
-            existing = db.execute_query(check_query, (student_id, teacher_id))
-            
-            if not existing:
-                return {
-                    'success': False,
-                    'message': 'Student not found'
-                }
-            
-            student_info = dict(existing[0])
-            
-            # Delete student
-            delete_query = """
-            DELETE FROM students 
-            WHERE id = ? AND teacher_id = ?
-            """
-            
-            rows_deleted = db.execute_update(delete_query, (student_id, teacher_id))
+            with db.transaction() as conn:
+                result = StudentController._delete_student(conn, student_id, teacher_id)
             
-            if rows_deleted:
-                return {
-                    'success': True,
-                    'message': f'Deleted {student_info["name"]} from {student_info["subject_name"]}'
-                }
-            else:
-                return {
-                    'success': False,
-                    'message': 'Failed to delete student'
-                }
+            if result['success']:
+                student_cache.invalidate(teacher_id)
+            return result
                 
         except Exception as e:
             return {
@@ -213,10 +621,138 @@ class StudentController:
                 'message': f'Error deleting student: {str(e)}'
             }
     
+    # Write helpers that run on a caller-supplied connection inside its transaction,
+    # so single-row routes and POST /api/students/batch share the same statements.
+    
+    @staticmethod
+    def _upsert_student(conn, name, subject_name, marks, teacher_id):
+        """Insert a student, or add marks to the existing name/subject row"""
+        # Both statements run inside the caller's BEGIN IMMEDIATE, so no other writer
+        # can slip in between them. Whether the row was created comes from which
+        # statement returned it, never from last_insert_rowid(), which a long-lived
+        # connection keeps across rolled-back inserts.
+        insert_query = """
+        INSERT INTO students (name, subject_name, marks, teacher_id)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(name, subject_name, teacher_id) DO NOTHING
+        RETURNING id, marks
+        """
+        
+        update_query = """
+        UPDATE students
+        SET marks = marks + ?, updated_at = CURRENT_TIMESTAMP
+        WHERE name = ? AND subject_name = ? AND teacher_id = ?
+        RETURNING id, marks
+        """
+        
+        marks = int(marks)
+        result = conn.execute(insert_query, (name, subject_name, marks, teacher_id)).fetchone()
+        created = result is not None
+        if not created:
+            result = conn.execute(update_query, (marks, name, subject_name, teacher_id)).fetchone()
+        
+        if not result:
+            return {
+                'success': False,
+                'message': 'Failed to save student marks'
+            }
+        
+        if created:
+            return {
+                'success': True,
+                'message': f'Added new student: {name} in {subject_name}',
+                'action': 'created',
+                'student_id': result['id']
+            }
+        
+        return {
+            'success': True,
+            'message': f'Updated {name}\'s marks in {subject_name}. New total: {result["marks"]}',
+            'action': 'updated',
+            'student_id': result['id'],
+            'new_marks': result['marks']
+        }
+    
+    @staticmethod
+    def _update_student(conn, student_id, name, subject_name, marks, teacher_id):
+        """Overwrite a student's name, subject and marks"""
+        # Check if student exists and belongs to the teacher
+        existing = conn.execute(
+            "SELECT id FROM students WHERE id = ? AND teacher_id = ?",
+            (student_id, teacher_id)
+        ).fetchone()
+        
+        if not existing:
+            return {
+                'success': False,
+                'message': 'Student not found'
+            }
+        
+        # Check for duplicate name-subject combination (excluding current student)
+        duplicate = conn.execute(
+            """
+            SELECT id FROM students 
+            WHERE name = ? AND subject_name = ? AND teacher_id = ? AND id != ?
+            """,
+            (name, subject_name, teacher_id, student_id)
+        ).fetchone()
+        
+        if duplicate:
+            return {
+                'success': False,
+                'message': 'A student with this name and subject combination already exists'
+            }
+        
+        update_query = """
+        UPDATE students 
+        SET name = ?, subject_name = ?, marks = ?, updated_at = CURRENT_TIMESTAMP
+        WHERE id = ? AND teacher_id = ?
+        """
+        
+        if conn.execute(update_query, (name, subject_name, int(marks), student_id, teacher_id)).rowcount:
+            return {
+                'success': True,
+                'message': 'Student updated successfully'
+            }
+        return {
+            'success': False,
+            'message': 'Failed to update student'
+        }
+    
     @staticmethod
-    def get_student_by_id(student_id, teacher_id):
+    def _delete_student(conn, student_id, teacher_id):
+        """Delete a student, reporting who was removed"""
+        deleted = conn.execute(
+            """
+            DELETE FROM students 
+            WHERE id = ? AND teacher_id = ?
+            RETURNING name, subject_name
+            """,
+            (student_id, teacher_id)
+        ).fetchone()
+        
+        if not deleted:
+            return {
+                'success': False,
+                'message': 'Student not found'
+            }
+        return {
+            'success': True,
+            'message': f'Deleted {deleted["name"]} from {deleted["subject_name"]}'
+        }
+    
+    @staticmethod
+    def get_student_by_id(student_id, teacher_id, data_version=None):
         """Get a specific student by ID"""
         try:
+            if data_version is None:
+                data_version = StudentController.get_data_version(teacher_id)
+            
+            cache_key = ('student', data_version, student_id)
+            cached = student_cache.get(teacher_id, cache_key)
+            if cached is not None:
+                return cached
+            
             query = """
             SELECT id, name, subject_name, marks, created_at, updated_at
             FROM students 
@@ -226,10 +762,12 @@ class StudentController:
             results = db.execute_query(query, (student_id, teacher_id))
             
             if results:
-                return {
+                result = {
                     'success': True,
                     'student': dict(results[0])
                 }
+                student_cache.set(teacher_id, cache_key, result)
+                return result
             else:
                 return {
                     'success': False,
@@ -240,4 +778,31 @@ class StudentController:
             return {
                 'success': False,
                 'message': f'Error fetching student: {str(e)}'
-            }
\ No newline at end of file
+            }
+
+class AsyncStudentController:
+    """Awaitable versions of the StudentController read paths.
+
+    Each call runs the synchronous implementation, cache lookup included, as a
+    single hop onto the database threads rather than one hop per query.
+    """
+    
+    @staticmethod
+    async def get_data_version(teacher_id):
+        return await async_db.run_sync(StudentController.get_data_version, teacher_id)
+    
+    @staticmethod
+    async def get_all_students(teacher_id, **options):
+        return await async_db.run_sync(StudentController.get_all_students, teacher_id, **options)
+    
+    @staticmethod
+    async def search_students(teacher_id, text, limit=None, data_version=None):
+        return await async_db.run_sync(StudentController.search_students, teacher_id, text, limit, data_version)
+    
+    @staticmethod
+    async def get_statistics(teacher_id, data_version=None):
+        return await async_db.run_sync(StudentController.get_statistics, teacher_id, data_version)
+    
+    @staticmethod
+    async def get_student_by_id(student_id, teacher_id, data_version=None):
+        return await async_db.run_sync(StudentController.get_student_by_id, student_id, teacher_id, data_version)
@@ -1,48 +1,398 @@
+import asyncio
+import contextvars
+import functools
 import sqlite3
 import os
+import queue
+import re
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
-from config import Config
+from config import get_config
+from helpers.metrics import metrics
+
+_PRAGMA_NAME = re.compile(r'^[a-z_]+$')
+
+# Database-level settings only the writer may change; read-only connections skip them
+_WRITER_ONLY_PRAGMAS = ('journal_mode',)
+
+class PoolTimeoutError(sqlite3.OperationalError):
+    """Raised when no pooled connection becomes available in time"""
+    pass
+
+class TimedCursor(sqlite3.Cursor):
+    """Cursor that reports how long each statement takes to the metrics registry"""
+
+    def execute(self, sql, parameters=()):
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            metrics.observe_query(sql, time.perf_counter() - started)
+
+    def executemany(self, sql, seq_of_parameters):
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            metrics.observe_query(sql, time.perf_counter() - started)
+
+class TimedConnection(sqlite3.Connection):
+    """Connection whose cursors, including the ones behind conn.execute, are timed"""
+
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+class ConnectionPool:
+    """Thread-safe, bounded pool of long-lived SQLite connections.
+
+    Local SQLite connections do not go stale, so a connection is only
+    health-checked on checkout after it raised an error or sat idle for more
+    than idle_check_seconds; the common checkout runs no extra statement.
+    """
+
+    def __init__(self, connect, max_size=5, timeout=10.0, health_check=True, idle_check_seconds=60.0):
+        self._connect = connect
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check = health_check
+        self.idle_check_seconds = idle_check_seconds
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._open = 0
+        self._in_use = 0
+        self._hits = 0
+        self._misses = 0
+        self._waits = 0
+        self._timeouts = 0
+        self._discarded = 0
+
+    def acquire(self):
+        """Borrow a connection, opening a new one while under max_size"""
+        try:
+            conn, released_at, failed = self._idle.get_nowait()
+            with self._lock:
+                self._hits += 1
+        except queue.Empty:
+            conn, released_at, failed = self._open_or_wait()
+
+        if self.health_check and self._needs_check(released_at, failed) and not self._is_healthy(conn):
+            self._close(conn)
+            conn = self._create()
+
+        with self._lock:
+            self._in_use += 1
+        return conn
+
+    def release(self, conn, discard=False, failed=False):
+        """Return a connection to the pool, closing it if it is unusable.
+
+        failed marks a connection that raised an error so the next checkout
+        health-checks it first.
+        """
+        with self._lock:
+            self._in_use -= 1
+
+        if not discard:
+            try:
+                if conn.in_transaction:
+                    conn.rollback()
+            except sqlite3.Error:
+                discard = True
+
+        if discard:
+            self._close(conn)
+        else:
+            self._idle.put((conn, time.monotonic(), failed))
+
+    def close_all(self):
+        """Close every idle connection (borrowed ones close on release)"""
+        while True:
+            try:
+                conn, _, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._close(conn)
+
+    def stats(self):
+        """Snapshot of pool counters for sizing and monitoring"""
+        with self._lock:
+            return {
+                'max_size': self.max_size,
+                'open': self._open,
+                'in_use': self._in_use,
+                'idle': self._idle.qsize(),
+                'hits': self._hits,
+                'misses': self._misses,
+                'waits': self._waits,
+                'timeouts': self._timeouts,
+                'discarded': self._discarded
+            }
+
+    def _open_or_wait(self):
+        with self._lock:
+            can_open = self._open < self.max_size
+            if can_open:
+                self._open += 1
+                self._misses += 1
+            else:
+                self._waits += 1
+
+        if can_open:
+            try:
+                # A brand-new connection needs no health check
+                return self._connect(), None, False
+            except Exception:
+                with self._lock:
+                    self._open -= 1
+                raise
+
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            with self._lock:
+                self._timeouts += 1
+            raise PoolTimeoutError(
+                f'Timed out after {self.timeout}s waiting for a database connection'
+            )
+
+    def _create(self):
+        """Open a replacement connection for one that failed its health check"""
+        conn = self._connect()
+        with self._lock:
+            self._open += 1
+        return conn
+
+    def _close(self, conn):
+        with self._lock:
+            self._open -= 1
+            self._discarded += 1
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    def _needs_check(self, released_at, failed):
+        if failed:
+            return True
+        if released_at is None or self.idle_check_seconds is None:
+            return False
+        return time.monotonic() - released_at > self.idle_check_seconds
+
+    @staticmethod
+    def _is_healthy(conn):
+        try:
+            conn.execute('SELECT 1').fetchone()
+            return True
+        except sqlite3.Error:
+            return False
 
 class DatabaseConnection:
-    def __init__(self, db_path=None):
-        self.db_path = db_path or Config.DATABASE_PATH
+    """SQLite access with read/write routing.
+
+    Reads (execute_query, iter_query, read_connection) borrow from a pool of
+    read-only connections opened with a mode=ro URI and PRAGMA query_only, so
+    any number of threads can read concurrently under WAL. Writes
+    (execute_update, execute_insert, transaction, get_connection) go through a
+    single writer connection serialized behind a lock, so writers queue in
+    Python instead of racing for SQLite's write lock and hitting "database is
+    locked". With read_write_split off, everything shares one read-write pool.
+    """
+
+    def __init__(self, db_path=None, pool_size=None, pool_timeout=None, pragmas=None, read_write_split=None):
+        config = get_config()
+        self.db_path = db_path or config.DATABASE_PATH
+        self.pragmas = config.SQLITE_PRAGMAS if pragmas is None else pragmas
+        self.read_write_split = config.DB_READ_WRITE_SPLIT if read_write_split is None else read_write_split
         self._ensure_database_exists()
-    
+        self.pool = ConnectionPool(
+            self._create_read_connection if self.read_write_split else self._create_connection,
+            max_size=pool_size or config.DB_POOL_SIZE,
+            timeout=pool_timeout or config.DB_POOL_TIMEOUT,
+            health_check=config.DB_POOL_HEALTH_CHECK,
+            idle_check_seconds=config.DB_POOL_IDLE_CHECK_SECONDS
+        )
+        self._writer = None
+        self._write_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._writes = 0
+        self._write_waits = 0
+        self._write_timeouts = 0
+
     def _ensure_database_exists(self):
         """Ensure the database directory and file exist"""
         db_dir = os.path.dirname(self.db_path)
-        if not os.path.exists(db_dir):
+        if db_dir and not os.path.exists(db_dir):
             os.makedirs(db_dir)
-    
+
+    def _create_connection(self, uri=None, readonly=False):
+        """Open a new connection that may be shared across threads by the pool"""
+        factory = TimedConnection if metrics.enabled else sqlite3.Connection
+        conn = sqlite3.connect(uri or self.db_path, check_same_thread=False, factory=factory, uri=uri is not None)
+        conn.row_factory = sqlite3.Row  # Enable dict-like access to rows
+        self._apply_pragmas(conn, readonly=readonly)
+        return conn
+
+    def _create_read_connection(self):
+        """Open a read-only connection: mode=ro at the file level, query_only inside SQLite"""
+        if not os.path.exists(self.db_path):
+            # A mode=ro open cannot create the file, so let the writer do it first
+            with self.write_connection():
+                pass
+        uri = f'file:{urllib.request.pathname2url(os.path.abspath(self.db_path))}?mode=ro'
+        conn = self._create_connection(uri=uri, readonly=True)
+        conn.execute('PRAGMA query_only = ON')
+        return conn
+
+    def _apply_pragmas(self, conn, readonly=False):
+        """Apply the configured PRAGMA profile to a fresh connection"""
+        for name, value in self.pragmas.items():
+            if not _PRAGMA_NAME.match(name):
+                raise ValueError(f'Invalid PRAGMA name: {name}')
+            if readonly and name in _WRITER_ONLY_PRAGMAS:
+                continue
+            conn.execute(f'PRAGMA {name} = {value}')
+
     @contextmanager
-    def get_connection(self):
-        """Context manager for database connections"""
-        conn = None
+    def read_connection(self):
+        """Context manager that borrows a pooled connection for reads"""
+        conn = self.pool.acquire()
+        discard = failed = False
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row  # Enable dict-like access to rows
             yield conn
         except sqlite3.Error as e:
-            if conn:
+            failed = True
+            try:
                 conn.rollback()
+            except sqlite3.Error:
+                discard = True
             raise e
         finally:
-            if conn:
-                conn.close()
-    
+            self.pool.release(conn, discard=discard, failed=failed)
+
+    @contextmanager
+    def read_snapshot(self):
+        """Borrow a read connection and run the block in one read transaction.
+
+        Every query in the block sees the same WAL snapshot, so multi-query reads
+        stay consistent with each other even while writers commit.
+        """
+        with self.read_connection() as conn:
+            conn.execute('BEGIN')
+            try:
+                yield conn
+            finally:
+                conn.commit()
+
+    @contextmanager
+    def write_connection(self):
+        """Context manager that holds the writer connection, one thread at a time"""
+        if not self.read_write_split:
+            with self.read_connection() as conn:
+                yield conn
+            return
+
+        self._acquire_writer()
+        try:
+            if self._writer is None:
+                self._writer = self._create_connection()
+            conn = self._writer
+            try:
+                yield conn
+            except sqlite3.Error as e:
+                try:
+                    conn.rollback()
+                except sqlite3.Error:
+                    self._close_writer()
+                raise e
+            finally:
+                # Never hand the next writer a half-finished transaction
+                if self._writer is not None and conn.in_transaction:
+                    try:
+                        conn.rollback()
+                    except sqlite3.Error:
+                        self._close_writer()
+        finally:
+            self._write_lock.release()
+
+    def _acquire_writer(self):
+        if self._write_lock.acquire(blocking=False):
+            with self._stats_lock:
+                self._writes += 1
+            return
+
+        with self._stats_lock:
+            self._write_waits += 1
+        timeout = self.pool.timeout
+        if not self._write_lock.acquire(timeout=timeout):
+            with self._stats_lock:
+                self._write_timeouts += 1
+            raise PoolTimeoutError(
+                f'Timed out after {timeout}s waiting for the database writer'
+            )
+        with self._stats_lock:
+            self._writes += 1
+
+    def _close_writer(self):
+        """Drop the writer connection so the next write reopens it"""
+        conn, self._writer = self._writer, None
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    # Writes through get_connection() keep working for existing callers
+    get_connection = write_connection
+
+    @contextmanager
+    def transaction(self):
+        """Hold the writer and run the block as one write transaction"""
+        with self.write_connection() as conn:
+            # IMMEDIATE takes the write lock up front instead of failing on upgrade
+            conn.execute('BEGIN IMMEDIATE')
+            yield conn
+            conn.commit()
+
+    def get_pool_stats(self):
+        """Return read pool and writer statistics"""
+        stats = self.pool.stats()
+        with self._stats_lock:
+            stats.update({
+                'read_write_split': int(self.read_write_split),
+                'writes': self._writes,
+                'write_waits': self._write_waits,
+                'write_timeouts': self._write_timeouts
+            })
+        return stats
+
+    def close(self):
+        """Close all idle pooled connections and the writer"""
+        self.pool.close_all()
+        with self._write_lock:
+            if self._writer is not None:
+                self._close_writer()
+
     def execute_query(self, query, params=None):
-        """Execute a query and return results"""
-        with self.get_connection() as conn:
+        """Execute a query on a read connection and return results"""
+        with self.read_connection() as conn:
             cursor = conn.cursor()
             if params:
                 cursor.execute(query, params)
             else:
                 cursor.execute(query)
             return cursor.fetchall()
-    
+
     def execute_update(self, query, params=None):
-        """Execute an update/insert/delete query"""
-        with self.get_connection() as conn:
+        """Execute an update/insert/delete query on the writer"""
+        with self.write_connection() as conn:
             cursor = conn.cursor()
             if params:
                 cursor.execute(query, params)
@@ -50,10 +400,10 @@ class DatabaseConnection:
                 cursor.execute(query)
             conn.commit()
             return cursor.rowcount
-    
+
     def execute_insert(self, query, params=None):
-        """Execute an insert query and return the last row id"""
-        with self.get_connection() as conn:
+        """Execute an insert query on the writer and return the last row id"""
+        with self.write_connection() as conn:
             cursor = conn.cursor()
             if params:
                 cursor.execute(query, params)
@@ -62,5 +412,68 @@ class DatabaseConnection:
             conn.commit()
             return cursor.lastrowid
 
+    def iter_query(self, query, params=None, batch_size=500):
+        """Yield rows in fetchmany batches, holding one read connection until exhausted"""
+        with self.read_connection() as conn:
+            cursor = conn.cursor()
+            if params:
+                cursor.execute(query, params)
+            else:
+                cursor.execute(query)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+
+class AsyncDatabaseConnection:
+    """Awaitable facade over a DatabaseConnection for async views.
+
+    sqlite3 has no non-blocking API, so every call runs on a dedicated thread
+    pool sized to the read pool plus one for the writer: the event loop never
+    waits on disk or locks, and no more queries run at once than there are
+    connections.
+    """
+
+    def __init__(self, database, workers=None):
+        self.database = database
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers or database.pool.max_size + 1,
+            thread_name_prefix='db'
+        )
+
+    async def run_sync(self, func, *args, **kwargs):
+        """Run a blocking callable on the database threads, keeping context variables (g, session)"""
+        loop = asyncio.get_running_loop()
+        call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+        return await loop.run_in_executor(self._executor, call)
+
+    async def execute_query(self, query, params=None):
+        """Execute a query and return results"""
+        return await self.run_sync(self.database.execute_query, query, params)
+
+    async def execute_update(self, query, params=None):
+        """Execute an update/insert/delete query"""
+        return await self.run_sync(self.database.execute_update, query, params)
+
+    async def execute_insert(self, query, params=None):
+        """Execute an insert query and return the last row id"""
+        return await self.run_sync(self.database.execute_insert, query, params)
+
+    async def run_in_transaction(self, func, *args):
+        """Call func(conn, *args) inside one write transaction and return its result"""
+        def run():
+            with self.database.transaction() as conn:
+                return func(conn, *args)
+        return await self.run_sync(run)
+
+    def close(self):
+        """Stop the worker threads and close idle connections"""
+        self._executor.shutdown(wait=True)
+        self.database.close()
+
 # Global database instance
-db = DatabaseConnection()
\ No newline at end of file
+db = DatabaseConnection()
+
+# Shares db's pool; used by async views
+async_db = AsyncDatabaseConnection(db)
@@ -1,39 +1,300 @@
-import bcrypt
 from database.db_connection import db
+from helpers.password_hasher import password_hasher
 
-def create_tables():
-    """Create database tables"""
-    
-    # Teachers table
-    teachers_table = """
-    CREATE TABLE IF NOT EXISTS teachers (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        username VARCHAR(50) UNIQUE NOT NULL,
-        email VARCHAR(100) UNIQUE NOT NULL,
-        password_hash VARCHAR(255) NOT NULL,
-        full_name VARCHAR(100) NOT NULL,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+# Ordered schema migrations: (version, description, statements).
+# Append new steps with the next version number; never edit an applied step.
+MIGRATIONS = [
+    (1, 'Create teachers and students tables', [
+        """
+        CREATE TABLE IF NOT EXISTS teachers (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username VARCHAR(50) UNIQUE NOT NULL,
+            email VARCHAR(100) UNIQUE NOT NULL,
+            password_hash VARCHAR(255) NOT NULL,
+            full_name VARCHAR(100) NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS students (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name VARCHAR(100) NOT NULL,
+            subject_name VARCHAR(100) NOT NULL,
+            marks INTEGER NOT NULL,
+            teacher_id INTEGER NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (teacher_id) REFERENCES teachers (id),
+            UNIQUE(name, subject_name, teacher_id)
+        )
+        """
+    ]),
+    (2, 'Add teacher-scoped indexes for student listings and lookups', [
+        "CREATE INDEX IF NOT EXISTS idx_students_teacher_name ON students (teacher_id, name, subject_name)",
+        "CREATE INDEX IF NOT EXISTS idx_students_teacher_subject_name ON students (teacher_id, subject_name, name)",
+        "CREATE INDEX IF NOT EXISTS idx_students_teacher_subject_marks ON students (teacher_id, subject_name, marks)",
+        "CREATE INDEX IF NOT EXISTS idx_students_teacher_marks ON students (teacher_id, marks)",
+        "CREATE INDEX IF NOT EXISTS idx_students_teacher_updated ON students (teacher_id, updated_at)"
+    ]),
+    (3, 'Track a per-teacher data version for ETags', [
+        """
+        CREATE TABLE IF NOT EXISTS teacher_data_versions (
+            teacher_id INTEGER PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        )
+        """,
+        """
+        INSERT OR IGNORE INTO teacher_data_versions (teacher_id, version)
+        SELECT DISTINCT teacher_id, 1 FROM students
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_students_version_insert AFTER INSERT ON students
+        BEGIN
+            INSERT INTO teacher_data_versions (teacher_id, version) VALUES (NEW.teacher_id, 1)
+            ON CONFLICT(teacher_id) DO UPDATE SET version = version + 1;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_students_version_update AFTER UPDATE ON students
+        BEGIN
+            INSERT INTO teacher_data_versions (teacher_id, version) VALUES (NEW.teacher_id, 1)
+            ON CONFLICT(teacher_id) DO UPDATE SET version = version + 1;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_students_version_delete AFTER DELETE ON students
+        BEGIN
+            INSERT INTO teacher_data_versions (teacher_id, version) VALUES (OLD.teacher_id, 1)
+            ON CONFLICT(teacher_id) DO UPDATE SET version = version + 1;
+        END
+        """
+    ]),
+    (4, 'Add trigger-maintained per-subject summary table', [
+        """
+        CREATE TABLE IF NOT EXISTS subject_summary (
+            teacher_id INTEGER NOT NULL,
+            subject_name VARCHAR(100) NOT NULL,
+            student_count INTEGER NOT NULL,
+            sum_marks INTEGER NOT NULL,
+            min_marks INTEGER,
+            max_marks INTEGER,
+            PRIMARY KEY (teacher_id, subject_name)
+        ) WITHOUT ROWID
+        """,
+        """
+        INSERT OR REPLACE INTO subject_summary
+            (teacher_id, subject_name, student_count, sum_marks, min_marks, max_marks)
+        SELECT teacher_id, subject_name, COUNT(*), SUM(marks), MIN(marks), MAX(marks)
+        FROM students
+        GROUP BY teacher_id, subject_name
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_students_summary_insert AFTER INSERT ON students
+        BEGIN
+            INSERT INTO subject_summary
+                (teacher_id, subject_name, student_count, sum_marks, min_marks, max_marks)
+            VALUES (NEW.teacher_id, NEW.subject_name, 1, NEW.marks, NEW.marks, NEW.marks)
+            ON CONFLICT(teacher_id, subject_name) DO UPDATE SET
+                student_count = student_count + 1,
+                sum_marks = sum_marks + excluded.sum_marks,
+                min_marks = MIN(min_marks, excluded.min_marks),
+                max_marks = MAX(max_marks, excluded.max_marks);
+        END
+        """,
+        # Removing a row only needs an index probe for min/max when it held the extreme
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_students_summary_delete AFTER DELETE ON students
+        BEGIN
+            UPDATE subject_summary SET
+                student_count = student_count - 1,
+                sum_marks = sum_marks - OLD.marks,
+                min_marks = CASE WHEN OLD.marks > min_marks THEN min_marks ELSE (
+                    SELECT MIN(marks) FROM students
+                    WHERE teacher_id = OLD.teacher_id AND subject_name = OLD.subject_name
+                ) END,
+                max_marks = CASE WHEN OLD.marks < max_marks THEN max_marks ELSE (
+                    SELECT MAX(marks) FROM students
+                    WHERE teacher_id = OLD.teacher_id AND subject_name = OLD.subject_name
+                ) END
+            WHERE teacher_id = OLD.teacher_id AND subject_name = OLD.subject_name;
+            
+            DELETE FROM subject_summary
+            WHERE teacher_id = OLD.teacher_id AND subject_name = OLD.subject_name AND student_count <= 0;
+        END
+        """,
+        # An update is the old row leaving its group and the new row joining one
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_students_summary_update
+        AFTER UPDATE OF marks, subject_name, teacher_id ON students
+        BEGIN
+            UPDATE subject_summary SET
+                student_count = student_count - 1,
+                sum_marks = sum_marks - OLD.marks,
+                min_marks = (
+                    SELECT MIN(marks) FROM students
+                    WHERE teacher_id = OLD.teacher_id AND subject_name = OLD.subject_name
+                ),
+                max_marks = (
+                    SELECT MAX(marks) FROM students
+                    WHERE teacher_id = OLD.teacher_id AND subject_name = OLD.subject_name
+                )
+            WHERE teacher_id = OLD.teacher_id AND subject_name = OLD.subject_name;
+            
+            DELETE FROM subject_summary
+            WHERE teacher_id = OLD.teacher_id AND subject_name = OLD.subject_name AND student_count <= 0;
+            
+            INSERT INTO subject_summary
+                (teacher_id, subject_name, student_count, sum_marks, min_marks, max_marks)
+            VALUES (NEW.teacher_id, NEW.subject_name, 1, NEW.marks, NEW.marks, NEW.marks)
+            ON CONFLICT(teacher_id, subject_name) DO UPDATE SET
+                student_count = student_count + 1,
+                sum_marks = sum_marks + excluded.sum_marks,
+                min_marks = MIN(min_marks, excluded.min_marks),
+                max_marks = MAX(max_marks, excluded.max_marks);
+        END
+        """
+    ]),
+    # Contentless FTS5 index: rows are joined back to students by rowid. The teacher id is
+    # an indexed token so matching is scoped to one teacher inside FTS itself.
+    (5, 'Add full-text search index over student names and subjects', [
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS students_fts USING fts5(
+            name, subject_name, teacher_id,
+            content = '',
+            prefix = '2 3 4',
+            tokenize = 'unicode61 remove_diacritics 2'
+        )
+        """,
+        # Name matches outrank subject matches; the teacher token never affects ranking
+        "INSERT INTO students_fts (students_fts, rank) VALUES ('rank', 'bm25(10.0, 5.0, 0.0)')",
+        """
+        INSERT INTO students_fts (rowid, name, subject_name, teacher_id)
+        SELECT id, name, subject_name, teacher_id FROM students
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_students_fts_insert AFTER INSERT ON students
+        BEGIN
+            INSERT INTO students_fts (rowid, name, subject_name, teacher_id)
+            VALUES (NEW.id, NEW.name, NEW.subject_name, NEW.teacher_id);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_students_fts_delete AFTER DELETE ON students
+        BEGIN
+            INSERT INTO students_fts (students_fts, rowid, name, subject_name, teacher_id)
+            VALUES ('delete', OLD.id, OLD.name, OLD.subject_name, OLD.teacher_id);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_students_fts_update
+        AFTER UPDATE OF name, subject_name, teacher_id ON students
+        BEGIN
+            INSERT INTO students_fts (students_fts, rowid, name, subject_name, teacher_id)
+            VALUES ('delete', OLD.id, OLD.name, OLD.subject_name, OLD.teacher_id);
+            INSERT INTO students_fts (rowid, name, subject_name, teacher_id)
+            VALUES (NEW.id, NEW.name, NEW.subject_name, NEW.teacher_id);
+        END
+        """
+    ]),
+    (6, 'Add server-side session table', [
+        """
+        CREATE TABLE IF NOT EXISTS sessions (
+            id VARCHAR(64) PRIMARY KEY,
+            data TEXT NOT NULL,
+            expires_at REAL NOT NULL
+        ) WITHOUT ROWID
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions (expires_at)"
+    ]),
+    (7, 'Add case-insensitive name index for prefix filtering', [
+        "CREATE INDEX IF NOT EXISTS idx_students_teacher_name_nocase ON students (teacher_id, name COLLATE NOCASE, subject_name)"
+    ])
+]
+
+def get_schema_version():
+    """Return the highest applied migration version (0 for a fresh database)"""
+    db.execute_update("""
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version INTEGER PRIMARY KEY,
+        description VARCHAR(255) NOT NULL,
+        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
     )
-    """
+    """)
     
-    # Students table
-    students_table = """
-    CREATE TABLE IF NOT EXISTS students (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        name VARCHAR(100) NOT NULL,
-        subject_name VARCHAR(100) NOT NULL,
-        marks INTEGER NOT NULL,
-        teacher_id INTEGER NOT NULL,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        FOREIGN KEY (teacher_id) REFERENCES teachers (id),
-        UNIQUE(name, subject_name, teacher_id)
-    )
-    """
+    results = db.execute_query("SELECT MAX(version) FROM schema_version")
+    return results[0][0] or 0
+
+def run_migrations():
+    """Apply pending migrations in order, each inside its own transaction"""
+    current_version = get_schema_version()
+    applied = 0
+    
+    for version, description, statements in MIGRATIONS:
+        if version <= current_version:
+            continue
+        
+        with db.get_connection() as conn:
+            # IMMEDIATE takes the write lock up front so concurrent workers serialize here
+            conn.execute("BEGIN IMMEDIATE")
+            already_applied = conn.execute(
+                "SELECT 1 FROM schema_version WHERE version = ?", (version,)
+            ).fetchone()
+            
+            if not already_applied:
+                for statement in statements:
+                    conn.execute(statement)
+                conn.execute(
+                    "INSERT INTO schema_version (version, description) VALUES (?, ?)",
+                    (version, description)
+                )
+                applied += 1
+                print(f"Applied migration {version}: {description}")
+            
+            conn.commit()
     
+    return applied
+
+SUBJECT_SUMMARY_QUERY = """
+SELECT teacher_id, subject_name, COUNT(*) AS student_count, SUM(marks) AS sum_marks,
+       MIN(marks) AS min_marks, MAX(marks) AS max_marks
+FROM students
+GROUP BY teacher_id, subject_name
+"""
+
+def check_subject_summary():
+    """Compare subject_summary with a fresh aggregate and return the mismatched groups"""
+    expected = {
+        (row['teacher_id'], row['subject_name']): tuple(row)[2:]
+        for row in db.execute_query(SUBJECT_SUMMARY_QUERY)
+    }
+    actual = {
+        (row['teacher_id'], row['subject_name']): tuple(row)[2:]
+        for row in db.execute_query("""
+        SELECT teacher_id, subject_name, student_count, sum_marks, min_marks, max_marks
+        FROM subject_summary
+        """)
+    }
+    
+    return [
+        {'teacher_id': key[0], 'subject_name': key[1], 'expected': expected.get(key), 'actual': actual.get(key)}
+        for key in sorted(set(expected) | set(actual))
+        if expected.get(key) != actual.get(key)
+    ]
+
+def rebuild_subject_summary():
+    """Recompute subject_summary from the students table in one transaction"""
+    with db.transaction() as conn:
+        conn.execute("DELETE FROM subject_summary")
+        conn.execute(f"""
+        INSERT INTO subject_summary
+            (teacher_id, subject_name, student_count, sum_marks, min_marks, max_marks)
+        {SUBJECT_SUMMARY_QUERY}
+        """)
+
+def create_tables():
+    """Create or upgrade database tables by running pending migrations"""
     try:
-        db.execute_update(teachers_table)
-        db.execute_update(students_table)
+        run_migrations()
         print("Tables created successfully!")
         return True
     except Exception as e:
@@ -43,43 +304,56 @@ def create_tables():
 def create_sample_data():
     """Create sample teachers and students for testing"""
     
+    # Skip the bcrypt hash and inserts entirely once the sample teacher exists
+    existing = db.execute_query("SELECT id FROM teachers WHERE username = ?", ('teacher1',))
+    if existing:
+        print("Sample data already present, skipping.")
+        return True
+    
     # Create sample teacher
     password = "teacher123"
-    hashed_password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
+    hashed_password = password_hasher.hash(password)
     
     teacher_query = """
     INSERT OR IGNORE INTO teachers (username, email, password_hash, full_name)
     VALUES (?, ?, ?, ?)
     """
     
+    # Create sample students
+    students_data = [
+        ('Alice Johnson', 'Mathematics', 85),
+        ('Bob Smith', 'Physics', 78),
+        ('Carol Davis', 'Chemistry', 92),
+        ('David Wilson', 'Mathematics', 76),
+        ('Eve Brown', 'Physics', 88),
+        ('Frank Miller', 'Chemistry', 94),
+        ('Grace Lee', 'Mathematics', 89),
+        ('Henry Garcia', 'Physics', 82)
+    ]
+    
+    student_query = """
+    INSERT OR IGNORE INTO students (name, subject_name, marks, teacher_id)
+    VALUES (?, ?, ?, ?)
+    """
+    
     try:
-        teacher_id = db.execute_insert(teacher_query, (
-            'teacher1',
-            'teacher@example.com',
-            hashed_password.decode('utf-8'),
-            'John Smith'
-        ))
-        
-        if teacher_id:
-            # Create sample students
-            students_data = [
-                ('Alice Johnson', 'Mathematics', 85),
-                ('Bob Smith', 'Physics', 78),
-                ('Carol Davis', 'Chemistry', 92),
-                ('David Wilson', 'Mathematics', 76),
-                ('Eve Brown', 'Physics', 88),
-                ('Frank Miller', 'Chemistry', 94),
-                ('Grace Lee', 'Mathematics', 89),
-                ('Henry Garcia', 'Physics', 82)
-            ]
+        # Teacher and students go in as a single transaction
+        with db.get_connection() as conn:
+            cursor = conn.execute(teacher_query, (
+                'teacher1',
+                'teacher@example.com',
+                hashed_password,
+                'John Smith'
+            ))
             
-            student_query = """
-            INSERT OR IGNORE INTO students (name, subject_name, marks, teacher_id)
-            VALUES (?, ?, ?, ?)
-            """
+            if cursor.rowcount:
+                teacher_id = cursor.lastrowid
+                conn.executemany(student_query, [
+                    (name, subject, marks, teacher_id)
+                    for name, subject, marks in students_data
+                ])
             
-            for name, subject, marks in students_data:
-                db.execute_insert(student_query, (name, subject, marks, teacher_id))
+            conn.commit()
         
         print("Sample data created successfully!")
         print("Login credentials:")
@@ -91,17 +365,20 @@ def create_sample_data():
         print(f"Error creating sample data: {e}")
         return False
 
-def initialize_database():
-    """Initialize the database with tables and sample data"""
+def initialize_database(with_sample_data=True):
+    """Initialize the database with tables and, optionally, sample data"""
     print("Initializing database...")
     
-    if create_tables():
-        if create_sample_data():
-            print("Database initialization completed successfully!")
-        else:
-            print("Database tables created, but sample data creation failed.")
-    else:
+    if not create_tables():
         print("Database initialization failed!")
+        return False
+    
+    if with_sample_data and not create_sample_data():
+        print("Database tables created, but sample data creation failed.")
+        return False
+    
+    print("Database initialization completed successfully!")
+    return True
 
 if __name__ == "__main__":
-    initialize_database()
\ No newline at end of file
+    initialize_database()
@@ -0,0 +1,80 @@
+import hashlib
+import json
+import os
+import shutil
+from werkzeug.security import safe_join
+from helpers.compression import available_encodings, compress
+
+DIST_DIR = 'dist'
+MANIFEST_NAME = 'manifest.json'
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.svg', '.html', '.json', '.txt')
+
+# File suffix used for each precompressed variant
+ENCODING_SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+def build_assets(static_folder, level=9):
+    """Copy static files into static/dist under content-hashed names, with precompressed variants.
+
+    Returns the manifest mapping each source path (as passed to url_for('static'))
+    to its fingerprinted path inside dist/. The dist directory is rebuilt from
+    scratch so stale fingerprints do not accumulate.
+    """
+    dist_folder = os.path.join(static_folder, DIST_DIR)
+    shutil.rmtree(dist_folder, ignore_errors=True)
+
+    manifest = {}
+    for root, dirs, files in os.walk(static_folder):
+        dirs[:] = sorted(d for d in dirs if os.path.join(root, d) != dist_folder)
+        for filename in sorted(files):
+            source = os.path.join(root, filename)
+            relative = os.path.relpath(source, static_folder).replace(os.sep, '/')
+
+            with open(source, 'rb') as f:
+                data = f.read()
+
+            stem, extension = os.path.splitext(relative)
+            fingerprinted = f'{stem}.{hashlib.sha256(data).hexdigest()[:12]}{extension}'
+            target = os.path.join(dist_folder, fingerprinted)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, 'wb') as f:
+                f.write(data)
+
+            if extension in COMPRESSIBLE_EXTENSIONS:
+                for encoding in available_encodings():
+                    compressed = compress(data, encoding, level)
+                    # Only keep variants that actually save bytes
+                    if len(compressed) < len(data):
+                        with open(target + ENCODING_SUFFIXES[encoding], 'wb') as f:
+                            f.write(compressed)
+
+            manifest[relative] = f'{DIST_DIR}/{fingerprinted}'
+
+    with open(os.path.join(dist_folder, MANIFEST_NAME), 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+def load_manifest(static_folder):
+    """Read static/dist/manifest.json, or return an empty manifest if assets were not built"""
+    try:
+        with open(os.path.join(static_folder, DIST_DIR, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+def precompressed_variant(static_folder, filename, accept_encodings):
+    """Pick the best precompressed copy of a dist/ file the client accepts.
+
+    Returns (variant filename, encoding), or (filename, None) to send it as is.
+    """
+    path = safe_join(static_folder, filename)
+    if path is None:
+        return filename, None
+
+    present = [
+        encoding for encoding, suffix in ENCODING_SUFFIXES.items()
+        if os.path.isfile(path + suffix)
+    ]
+    encoding = accept_encodings.best_match(present) if present else None
+    if encoding is None:
+        return filename, None
+    return filename + ENCODING_SUFFIXES[encoding], encoding
@@ -0,0 +1,174 @@
+import threading
+import time
+from collections import OrderedDict
+from config import get_config
+
+# Lists longer than this are sized from their first SIZE_SAMPLE items
+SIZE_SAMPLE = 16
+
+def estimate_size(value):
+    """Rough encoded size of a cached value in bytes, without serialising it.
+
+    Strings (including pre-encoded RawJSON pages) count their length, other
+    scalars a fixed 8 bytes, and containers a couple of bytes per item on
+    top of their contents. Long lists are extrapolated from a sample.
+    """
+    if isinstance(value, str):
+        return len(value) + 2
+    if isinstance(value, dict):
+        return sum(estimate_size(key) + estimate_size(item) + 2 for key, item in value.items()) + 2
+    if isinstance(value, (list, tuple)):
+        count = len(value)
+        if count > SIZE_SAMPLE:
+            sampled = sum(estimate_size(item) + 1 for item in value[:SIZE_SAMPLE])
+            return sampled * count // SIZE_SAMPLE + 2
+        return sum(estimate_size(item) + 1 for item in value) + 2
+    return 8
+
+class MemoryCache:
+    """Thread-safe in-process LRU cache with per-entry TTL and a memory cap.
+
+    Entries live in a namespace (the teacher id for student data) so that
+    every entry for one teacher can be dropped at once after a write.
+    Sizes come from estimate_size rather than encoding each value.
+    """
+
+    def __init__(self, max_entries=1000, max_bytes=16 * 1024 * 1024, ttl=60):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._namespaces = {}
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+    def get(self, namespace, key):
+        """Return a cached value, or None on a miss"""
+        entry_key = (namespace, key)
+        with self._lock:
+            entry = self._entries.get(entry_key)
+            if entry is None:
+                self._misses += 1
+                return None
+
+            expires_at, _, value = entry
+            if expires_at < time.monotonic():
+                self._remove(entry_key)
+                self._expirations += 1
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(entry_key)
+            self._hits += 1
+            return value
+
+    def set(self, namespace, key, value, size=None):
+        """Store a value, evicting least recently used entries to stay within limits.
+
+        Callers that already know the value's encoded size can pass it to skip
+        the estimate.
+        """
+        if size is None:
+            size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+
+        entry_key = (namespace, key)
+        with self._lock:
+            if entry_key in self._entries:
+                self._remove(entry_key)
+
+            self._entries[entry_key] = (time.monotonic() + self.ttl, size, value)
+            self._namespaces.setdefault(namespace, set()).add(key)
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self._evictions += 1
+
+    def invalidate(self, namespace):
+        """Drop every entry in a namespace"""
+        with self._lock:
+            for key in self._namespaces.get(namespace, set()).copy():
+                self._remove((namespace, key))
+            self._invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._namespaces.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Snapshot of cache counters"""
+        with self._lock:
+            return {
+                'backend': 'memory',
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'expirations': self._expirations,
+                'invalidations': self._invalidations
+            }
+
+    def _remove(self, entry_key):
+        _, size, _ = self._entries.pop(entry_key)
+        self._bytes -= size
+        namespace, key = entry_key
+        keys = self._namespaces.get(namespace)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._namespaces[namespace]
+
+class NullCache:
+    """Cache backend that stores nothing, for disabling caching"""
+
+    def __init__(self, **options):
+        # Accepts (and ignores) the sizing options MemoryCache takes
+        pass
+
+    def get(self, namespace, key):
+        return None
+
+    def set(self, namespace, key, value, size=None):
+        pass
+
+    def invalidate(self, namespace):
+        pass
+
+    def clear(self):
+        pass
+
+    def stats(self):
+        return {'backend': 'null'}
+
+CACHE_BACKENDS = {
+    'memory': MemoryCache,
+    'null': NullCache
+}
+
+def create_cache(backend=None, **options):
+    """Build a cache from a backend name in CACHE_BACKENDS"""
+    config = get_config()
+    backend = backend or config.CACHE_BACKEND
+    if backend not in CACHE_BACKENDS:
+        raise ValueError(f'Unknown cache backend: {backend}')
+    if backend == 'memory':
+        options.setdefault('max_entries', config.CACHE_MAX_ENTRIES)
+        options.setdefault('max_bytes', config.CACHE_MAX_BYTES)
+        options.setdefault('ttl', config.CACHE_TTL)
+    return CACHE_BACKENDS[backend](**options)
+
+# Global cache for per-teacher student responses
+student_cache = create_cache()
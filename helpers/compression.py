@@ -0,0 +1,48 @@
+import gzip
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+def available_encodings():
+    """Content codings this process can produce, preferred first"""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+def compress(data, encoding, level):
+    """Compress bytes with a content coding from available_encodings()"""
+    if encoding == 'br':
+        # brotli quality runs 0-11; map the gzip-style 1-9 level onto it
+        return brotli.compress(data, quality=min(11, level))
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+def compress_response(response, accept_encodings, min_size, level, mimetypes):
+    """Compress a buffered response body in place when the client accepts it.
+
+    Streamed and pass-through (file) responses are left alone, as are small
+    bodies, non-2xx responses, other content types and anything already encoded.
+    """
+    if response.direct_passthrough or response.is_streamed:
+        return response
+    if not 200 <= response.status_code < 300 or response.status_code == 204:
+        return response
+    if response.mimetype not in mimetypes or 'Content-Encoding' in response.headers:
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = accept_encodings.best_match(available_encodings())
+    if encoding is None:
+        return response
+
+    data = response.get_data()
+    if len(data) < min_size:
+        return response
+
+    response.set_data(compress(data, encoding, level))
+    response.headers['Content-Encoding'] = encoding
+
+    # The compressed body is a different representation of the same resource
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
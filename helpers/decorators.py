@@ -0,0 +1,70 @@
+import inspect
+from functools import wraps
+from flask import g, jsonify, redirect, request, session, url_for
+from controllers.auth_controller import AuthController
+from database.db_connection import async_db
+
+def login_required(view):
+    """Resolve the logged-in teacher into g.teacher / g.teacher_id once per request.
+
+    The lookup goes through AuthController.get_teacher_by_id, which is backed by a
+    short TTL cache, so a teacher deleted from the database is rejected (and their
+    session cleared) without a database hit on every call. API routes get a 401
+    JSON response; pages redirect to the login screen. Async views get an async
+    wrapper that runs the lookup on the database threads.
+    """
+    if inspect.iscoroutinefunction(view):
+        @wraps(view)
+        async def async_wrapped(*args, **kwargs):
+            if 'teacher' not in g:
+                g.teacher = None
+                teacher_id = session.get('teacher_id')
+                if teacher_id is not None:
+                    result = await async_db.run_sync(AuthController.get_teacher_by_id, teacher_id)
+                    error = _store_teacher(result)
+                    if error is not None:
+                        return error
+
+            if g.teacher is None:
+                return _not_authenticated()
+
+            g.teacher_id = g.teacher['id']
+            return await view(*args, **kwargs)
+
+        return async_wrapped
+
+    @wraps(view)
+    def wrapped(*args, **kwargs):
+        if 'teacher' not in g:
+            g.teacher = None
+            teacher_id = session.get('teacher_id')
+            if teacher_id is not None:
+                error = _store_teacher(AuthController.get_teacher_by_id(teacher_id))
+                if error is not None:
+                    return error
+
+        if g.teacher is None:
+            return _not_authenticated()
+
+        g.teacher_id = g.teacher['id']
+        return view(*args, **kwargs)
+
+    return wrapped
+
+def _store_teacher(result):
+    """Put a teacher lookup into g, clearing stale sessions; returns an error response on failure"""
+    if result['success']:
+        g.teacher = result['teacher']
+    elif result.get('error_code') == 'not_found':
+        session.clear()
+    else:
+        return jsonify(result), 500
+    return None
+
+def _not_authenticated():
+    if request.path.startswith('/api/'):
+        return jsonify({
+            'success': False,
+            'message': 'Not authenticated'
+        }), 401
+    return redirect(url_for('login'))
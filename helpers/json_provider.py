@@ -0,0 +1,71 @@
+import json
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+class RawJSON(str):
+    """Already-encoded JSON text, spliced verbatim when it is a value of the top-level dict.
+
+    Lets a controller hand over JSON built elsewhere (e.g. by SQLite's json_object)
+    without decoding it into Python objects just to encode it again.
+    """
+    pass
+
+def _encode_with_raw(obj, encode):
+    """Encode obj to bytes with encode(), splicing in top-level RawJSON values"""
+    if isinstance(obj, dict) and any(isinstance(value, RawJSON) for value in obj.values()):
+        parts = [
+            encode(str(key)) + b':' + (value.encode('utf-8') if isinstance(value, RawJSON) else encode(value))
+            for key, value in obj.items()
+        ]
+        return b'{' + b','.join(parts) + b'}'
+    return encode(obj)
+
+class StdlibJSONProvider(DefaultJSONProvider):
+    """Flask's default provider plus RawJSON support"""
+
+    def dumps(self, obj, **kwargs):
+        kwargs.setdefault('default', self.default)
+        kwargs.setdefault('ensure_ascii', self.ensure_ascii)
+        kwargs.setdefault('sort_keys', self.sort_keys)
+        return _encode_with_raw(obj, lambda value: json.dumps(value, **kwargs).encode('utf-8')).decode('utf-8')
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson; keys keep insertion order instead of being sorted"""
+
+    sort_keys = False
+
+    def _encode(self, obj):
+        option = orjson.OPT_NON_STR_KEYS
+        if self.compact is False or (self.compact is None and self._app.debug):
+            option |= orjson.OPT_INDENT_2
+        return _encode_with_raw(obj, lambda value: orjson.dumps(value, default=self.default, option=option))
+
+    def dumps(self, obj, **kwargs):
+        return self._encode(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        """Build the response straight from orjson's bytes"""
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self._encode(obj), mimetype=self.mimetype)
+
+JSON_PROVIDERS = {
+    'stdlib': StdlibJSONProvider,
+    'orjson': OrjsonProvider
+}
+
+def create_json_provider(app, name='auto'):
+    """Build the provider named by JSON_PROVIDER; 'auto' picks orjson when it is installed"""
+    if name == 'auto':
+        name = 'orjson' if orjson is not None else 'stdlib'
+    if name not in JSON_PROVIDERS:
+        raise ValueError(f'Unknown JSON provider: {name}')
+    if name == 'orjson' and orjson is None:
+        raise ValueError('JSON_PROVIDER=orjson requires the orjson package')
+    return JSON_PROVIDERS[name](app)
@@ -0,0 +1,155 @@
+import logging
+import threading
+from bisect import bisect_left
+from config import get_config
+
+logger = logging.getLogger(__name__)
+
+REQUEST_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+# Label used once the number of distinct query texts reaches max_query_series
+OTHER_QUERY = 'other'
+
+class Histogram:
+    """Fixed-bucket histogram with Prometheus 'le' (less than or equal) semantics"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """Yield (le, cumulative count) pairs ending with +Inf"""
+        total = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            yield ('+Inf' if bound == float('inf') else repr(bound)), total
+
+class MetricsRegistry:
+    """Per-process request and query timings, rendered in Prometheus text format.
+
+    Requests are keyed by URL rule (not the concrete path) so ids do not create
+    new series; queries are keyed by their whitespace-normalised SQL text.
+    """
+
+    def __init__(self, enabled=True, slow_query_seconds=0.1, max_query_series=200):
+        self.enabled = enabled
+        self.slow_query_seconds = slow_query_seconds
+        self.max_query_series = max_query_series
+        self._lock = threading.Lock()
+        self._requests = {}
+        self._responses = {}
+        self._queries = {}
+        self._slow_queries = 0
+        self._labels = {}
+
+    def observe_request(self, method, route, status, seconds):
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._requests.get((method, route))
+            if histogram is None:
+                histogram = self._requests[(method, route)] = Histogram(REQUEST_BUCKETS)
+            histogram.observe(seconds)
+            key = (method, route, status)
+            self._responses[key] = self._responses.get(key, 0) + 1
+
+    def observe_query(self, sql, seconds):
+        if not self.enabled:
+            return
+        label = self._labels.get(sql)
+        if label is None:
+            label = ' '.join(sql.split())
+
+        with self._lock:
+            if sql not in self._labels and len(self._labels) < self.max_query_series:
+                self._labels[sql] = label
+            histogram = self._queries.get(label)
+            if histogram is None:
+                if len(self._queries) >= self.max_query_series:
+                    label = OTHER_QUERY
+                    histogram = self._queries.get(label)
+                if histogram is None:
+                    histogram = self._queries[label] = Histogram(QUERY_BUCKETS)
+            histogram.observe(seconds)
+            slow = seconds >= self.slow_query_seconds
+            if slow:
+                self._slow_queries += 1
+
+        if slow:
+            logger.warning('Slow query (%.1f ms): %s', seconds * 1000, label)
+
+    def reset(self):
+        with self._lock:
+            self._requests.clear()
+            self._responses.clear()
+            self._queries.clear()
+            self._labels.clear()
+            self._slow_queries = 0
+
+    def render(self, gauges=None):
+        """Render every metric in Prometheus text exposition format.
+
+        ``gauges`` maps a metric prefix to a stats dict (e.g. pool or cache
+        stats); each numeric value becomes a ``<prefix>_<key>`` gauge.
+        """
+        lines = []
+        with self._lock:
+            lines.append('# HELP http_request_duration_seconds Time spent handling a request, by route.')
+            lines.append('# TYPE http_request_duration_seconds histogram')
+            for (method, route), histogram in sorted(self._requests.items()):
+                _histogram_lines(lines, 'http_request_duration_seconds', histogram,
+                                 f'method="{_escape(method)}",route="{_escape(route)}"')
+
+            lines.append('# HELP http_requests_total Responses sent, by route and status code.')
+            lines.append('# TYPE http_requests_total counter')
+            for (method, route, status), count in sorted(self._responses.items()):
+                lines.append(f'http_requests_total{{method="{_escape(method)}",route="{_escape(route)}",'
+                             f'status="{status}"}} {count}')
+
+            lines.append('# HELP db_query_duration_seconds Time spent executing a statement, by SQL text.')
+            lines.append('# TYPE db_query_duration_seconds histogram')
+            for query, histogram in sorted(self._queries.items()):
+                _histogram_lines(lines, 'db_query_duration_seconds', histogram, f'query="{_escape(query)}"')
+
+            lines.append(f'# HELP db_slow_queries_total Statements slower than {self.slow_query_seconds}s.')
+            lines.append('# TYPE db_slow_queries_total counter')
+            lines.append(f'db_slow_queries_total {self._slow_queries}')
+
+        for prefix, stats in (gauges or {}).items():
+            for key, value in stats.items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                lines.append(f'# TYPE {prefix}_{key} gauge')
+                lines.append(f'{prefix}_{key} {value}')
+
+        return '\n'.join(lines) + '\n'
+
+def _histogram_lines(lines, name, histogram, labels):
+    for le, count in histogram.cumulative():
+        lines.append(f'{name}_bucket{{{labels},le="{le}"}} {count}')
+    lines.append(f'{name}_sum{{{labels}}} {histogram.sum}')
+    lines.append(f'{name}_count{{{labels}}} {histogram.count}')
+
+def _escape(value):
+    """Escape a Prometheus label value"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def create_metrics():
+    """Build the metrics registry from configuration"""
+    config = get_config()
+    return MetricsRegistry(
+        enabled=config.METRICS_ENABLED,
+        slow_query_seconds=config.SLOW_QUERY_MS / 1000,
+        max_query_series=config.METRICS_MAX_QUERY_SERIES
+    )
+
+# Global metrics registry shared by the database layer and the app
+metrics = create_metrics()
@@ -0,0 +1,83 @@
+import threading
+import bcrypt
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from config import get_config
+
+class HasherBusyError(Exception):
+    """Raised when the bcrypt pool is saturated and a request should be retried later"""
+    pass
+
+class PasswordHasher:
+    """Runs bcrypt on a small dedicated thread pool with a bounded queue.
+
+    bcrypt releases the GIL while hashing, so a few worker threads keep the
+    CPU-bound work off the request threads' critical section, while the
+    semaphore caps how much work can pile up during a login storm.
+    """
+
+    def __init__(self, rounds=None, workers=None, max_pending=None, timeout=None):
+        config = get_config()
+        self.rounds = rounds or config.BCRYPT_ROUNDS
+        self.timeout = timeout or config.BCRYPT_TIMEOUT
+        workers = workers or config.BCRYPT_WORKERS
+        max_pending = config.BCRYPT_MAX_PENDING if max_pending is None else max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='bcrypt')
+        self._slots = threading.BoundedSemaphore(workers + max_pending)
+        self._lock = threading.Lock()
+        self._completed = 0
+        self._rejected = 0
+        self._timeouts = 0
+
+    def hash(self, password):
+        """Hash a password with the configured cost factor"""
+        hashed = self._run(bcrypt.hashpw, password.encode('utf-8'), bcrypt.gensalt(self.rounds))
+        return hashed.decode('utf-8')
+
+    def verify(self, password, password_hash):
+        """Check a password against a stored bcrypt hash"""
+        return self._run(bcrypt.checkpw, password.encode('utf-8'), password_hash.encode('utf-8'))
+
+    def needs_rehash(self, password_hash):
+        """True when a stored hash was made with a different cost factor"""
+        try:
+            return int(password_hash.split('$')[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
+
+    def stats(self):
+        """Snapshot of pool counters"""
+        with self._lock:
+            return {
+                'rounds': self.rounds,
+                'completed': self._completed,
+                'rejected': self._rejected,
+                'timeouts': self._timeouts
+            }
+
+    def _run(self, func, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise HasherBusyError('Password verification is busy, please retry shortly')
+
+        try:
+            future = self._executor.submit(func, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(self._on_done)
+
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            with self._lock:
+                self._timeouts += 1
+            raise HasherBusyError('Password verification timed out, please retry shortly')
+
+    def _on_done(self, future):
+        self._slots.release()
+        with self._lock:
+            self._completed += 1
+
+# Global password hasher instance
+password_hasher = PasswordHasher()
@@ -0,0 +1,157 @@
+import json
+import secrets
+import threading
+import time
+from flask.sessions import SessionInterface, SessionMixin
+from werkzeug.datastructures import CallbackDict
+from config import get_config
+from database.db_connection import db
+
+class ServerSideSession(CallbackDict, SessionMixin):
+    """Session whose data lives in a store; the cookie only carries its id"""
+
+    def __init__(self, initial=None, sid=None, new=False, needs_refresh=False):
+        def on_update(session):
+            session.modified = True
+
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.new = new
+        self.modified = False
+        self.needs_refresh = needs_refresh
+        self.previous_sid = None
+
+    def regenerate(self):
+        """Move the data to a fresh id on save, e.g. after login, to prevent fixation"""
+        if self.sid and not self.new:
+            self.previous_sid = self.sid
+        self.sid = secrets.token_urlsafe(32)
+        self.modified = True
+
+class MemorySessionStore:
+    """Per-process session store with TTL eviction (single worker / development)"""
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def get(self, sid):
+        """Return (data, expires_at) or None if missing or expired"""
+        with self._lock:
+            entry = self._sessions.get(sid)
+            if entry is None:
+                return None
+            if entry[1] < time.time():
+                del self._sessions[sid]
+                return None
+            return entry
+
+    def set(self, sid, data):
+        with self._lock:
+            self._sessions[sid] = (dict(data), time.time() + self.ttl)
+            self._writes += 1
+            if self._writes % 100 == 0:
+                self._evict_expired()
+
+    def delete(self, sid):
+        with self._lock:
+            self._sessions.pop(sid, None)
+
+    def _evict_expired(self):
+        now = time.time()
+        for sid in [sid for sid, (_, expires_at) in self._sessions.items() if expires_at < now]:
+            del self._sessions[sid]
+
+class SQLiteSessionStore:
+    """Session store backed by the sessions table, shared by every worker process"""
+
+    def __init__(self, db, ttl):
+        self.db = db
+        self.ttl = ttl
+        self._writes = 0
+
+    def get(self, sid):
+        """Return (data, expires_at) or None if missing or expired"""
+        results = self.db.execute_query(
+            "SELECT data, expires_at FROM sessions WHERE id = ? AND expires_at >= ?",
+            (sid, time.time())
+        )
+        if not results:
+            return None
+        return json.loads(results[0]['data']), results[0]['expires_at']
+
+    def set(self, sid, data):
+        self.db.execute_update(
+            """
+            INSERT INTO sessions (id, data, expires_at) VALUES (?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET data = excluded.data, expires_at = excluded.expires_at
+            """,
+            (sid, json.dumps(dict(data), separators=(',', ':')), time.time() + self.ttl)
+        )
+        self._writes += 1
+        if self._writes % 100 == 0:
+            self.db.execute_update("DELETE FROM sessions WHERE expires_at < ?", (time.time(),))
+
+    def delete(self, sid):
+        self.db.execute_update("DELETE FROM sessions WHERE id = ?", (sid,))
+
+class ServerSideSessionInterface(SessionInterface):
+    """Flask session interface keeping only an opaque session id in the cookie"""
+
+    def __init__(self, store):
+        self.store = store
+
+    def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if sid:
+            entry = self.store.get(sid)
+            if entry is not None:
+                data, expires_at = entry
+                # Slide the expiry forward once half of the lifetime has been used
+                needs_refresh = expires_at - time.time() < self.store.ttl / 2
+                return ServerSideSession(data, sid=sid, needs_refresh=needs_refresh)
+        return ServerSideSession(sid=secrets.token_urlsafe(32), new=True)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        if session.previous_sid:
+            self.store.delete(session.previous_sid)
+            session.previous_sid = None
+
+        if not session:
+            if session.modified and not session.new:
+                self.store.delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        if not (session.modified or session.needs_refresh):
+            return
+
+        self.store.set(session.sid, session)
+        response.set_cookie(
+            name,
+            session.sid,
+            max_age=int(self.store.ttl),
+            httponly=self.get_cookie_httponly(app),
+            secure=self.get_cookie_secure(app),
+            samesite=self.get_cookie_samesite(app),
+            domain=domain,
+            path=path
+        )
+
+def create_session_interface(backend=None):
+    """Build the session interface named by SESSION_BACKEND, or None for Flask's signed cookie"""
+    config = get_config()
+    backend = backend or config.SESSION_BACKEND
+    if backend == 'cookie':
+        return None
+    if backend == 'memory':
+        return ServerSideSessionInterface(MemorySessionStore(config.SESSION_TTL))
+    if backend == 'sqlite':
+        return ServerSideSessionInterface(SQLiteSessionStore(db, config.SESSION_TTL))
+    raise ValueError(f'Unknown session backend: {backend}')
@@ -1,13 +1,25 @@
 import re
+import io
+import csv
+import json
+import base64
+import binascii
+import hashlib
+import threading
+from bisect import bisect_right
+from itertools import islice
 from datetime import datetime
+from config import get_config
+from helpers.validation import MARKS_LIMIT, STUDENT_SCHEMA, format_errors
+
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
 
 def validate_email(email):
     """Validate email format"""
     if not email:
         return False
     
-    email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(email_pattern, email) is not None
+    return EMAIL_PATTERN.match(email) is not None
 
 def validate_password(password):
     """Validate password strength"""
@@ -18,39 +30,14 @@ def validate_password(password):
     return len(password) >= 6
 
 def validate_student_data(name, subject_name, marks):
-    """Validate student data"""
-    errors = []
-    
-    # Validate name
-    if not name or not name.strip():
-        errors.append("Student name is required")
-    elif len(name.strip()) < 2:
-        errors.append("Student name must be at least 2 characters long")
-    elif len(name.strip()) > 100:
-        errors.append("Student name must be less than 100 characters")
-    
-    # Validate subject name
-    if not subject_name or not subject_name.strip():
-        errors.append("Subject name is required")
-    elif len(subject_name.strip()) < 2:
-        errors.append("Subject name must be at least 2 characters long")
-    elif len(subject_name.strip()) > 100:
-        errors.append("Subject name must be less than 100 characters")
-    
-    # Validate marks
-    try:
-        marks_int = int(marks)
-        if marks_int < 0:
-            errors.append("Marks cannot be negative")
-        elif marks_int > 1000:
-            errors.append("Marks cannot exceed 1000")
-    except (ValueError, TypeError):
-        errors.append("Marks must be a valid number")
+    """Validate student data against STUDENT_SCHEMA"""
+    _, errors = STUDENT_SCHEMA.check_values(name, subject_name, marks)
     
     if errors:
         return {
             'valid': False,
-            'message': '; '.join(errors)
+            'message': format_errors(errors),
+            'errors': errors
         }
     
     return {
@@ -66,6 +53,91 @@ def sanitize_string(text):
     # Remove extra whitespace and strip
     return ' '.join(text.strip().split())
 
+def encode_cursor(values):
+    """Encode keyset pagination values into an opaque URL-safe token"""
+    raw = json.dumps(values, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(token):
+    """Decode a token produced by encode_cursor, or return None if it is malformed"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, binascii.Error, UnicodeError):
+        return None
+    
+    return values if isinstance(values, list) else None
+
+def iter_csv_records(stream):
+    """Yield (line_number, record_or_error) pairs from a CSV byte stream with a header row"""
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding='utf-8-sig', newline=''))
+    
+    for record in reader:
+        if None in record:
+            yield reader.line_num, 'Too many columns'
+        else:
+            yield reader.line_num, record
+
+def iter_ndjson_records(stream):
+    """Yield (line_number, record_or_error) pairs from a JSON-lines byte stream"""
+    for line_number, line in enumerate(io.TextIOWrapper(stream, encoding='utf-8'), start=1):
+        if not line.strip():
+            continue
+        
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield line_number, 'Invalid JSON'
+            continue
+        
+        if isinstance(record, dict):
+            yield line_number, record
+        else:
+            yield line_number, 'Each line must be a JSON object'
+
+def iter_csv_chunks(columns, rows, rows_per_chunk=500):
+    """Serialize rows to CSV text, yielding the header first and then one chunk per batch"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue()
+    
+    buffer.seek(0)
+    buffer.truncate()
+    pending = 0
+    for row in rows:
+        writer.writerow(row)
+        pending += 1
+        if pending >= rows_per_chunk:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    
+    if pending:
+        yield buffer.getvalue()
+
+def iter_ndjson_chunks(columns, rows, rows_per_chunk=500):
+    """Serialize rows to JSON lines, yielding one chunk per batch"""
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(dict(zip(columns, row)), separators=(',', ':')))
+        if len(lines) >= rows_per_chunk:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+    
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+def make_etag(*parts):
+    """Build a stable ETag value from arbitrary repr-able parts"""
+    return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()[:32]
+
+def build_fts_query(text):
+    """Turn free text into an FTS5 query that prefix-matches every word"""
+    terms = re.findall(r'\w+', text or '', re.UNICODE)
+    return ' AND '.join(f'"{term}"*' for term in terms)
+
 def format_datetime(dt_string):
     """Format datetime string for display"""
     try:
@@ -98,30 +170,143 @@ def generate_error_response(message, error_code=None):
     
     return response
 
-def calculate_grade(marks):
+class GradingScheme:
+    """Grade and colour boundaries compiled into per-mark lookup tables.
+
+    Boundaries are (minimum percentage of max_marks, value) pairs, highest first,
+    ending at 0. Integer marks up to MARKS_LIMIT are a list index; anything else
+    (fractions, negative or out-of-range values) falls back to a bisect over the thresholds.
+    """
+
+    def __init__(self, boundaries, colors, max_marks=100):
+        self.max_marks = max_marks
+        self.boundaries = tuple(boundaries)
+        self.grades = tuple(grade for _, grade in self.boundaries)
+        self._grade_steps = self._compile_steps(self.boundaries)
+        self._color_steps = self._compile_steps(colors)
+        self._grade_table = [self._step_lookup(self._grade_steps, marks) for marks in range(MARKS_LIMIT + 1)]
+        self._color_table = [self._step_lookup(self._color_steps, marks) for marks in range(MARKS_LIMIT + 1)]
+
+    def _compile_steps(self, boundaries):
+        """Turn percentage boundaries into ascending (mark thresholds, values)"""
+        thresholds = [minimum for minimum, _ in boundaries]
+        if not thresholds or thresholds[-1] != 0 or thresholds != sorted(set(thresholds), reverse=True):
+            raise ValueError('Grade boundaries must be strictly descending percentages ending at 0')
+        ascending = list(reversed(boundaries))
+        return [minimum * self.max_marks / 100 for minimum, _ in ascending], [value for _, value in ascending]
+
+    @staticmethod
+    def _step_lookup(steps, marks):
+        thresholds, values = steps
+        return values[max(bisect_right(thresholds, marks) - 1, 0)]
+
+    def grade(self, marks):
+        """Letter grade for one mark"""
+        try:
+            if marks >= 0:
+                return self._grade_table[marks]
+        except (TypeError, IndexError):
+            pass
+        return self._step_lookup(self._grade_steps, marks)
+
+    def color(self, marks):
+        """Display colour for one mark"""
+        try:
+            if marks >= 0:
+                return self._color_table[marks]
+        except (TypeError, IndexError):
+            pass
+        return self._step_lookup(self._color_steps, marks)
+
+    def grade_many(self, marks_column):
+        """Grade a whole column of marks; one C-level table pass when all are valid integer marks"""
+        if not isinstance(marks_column, (list, tuple)):
+            marks_column = list(marks_column)
+        if not marks_column:
+            return []
+        try:
+            if min(marks_column) >= 0:
+                return list(map(self._grade_table.__getitem__, marks_column))
+        except (TypeError, IndexError):
+            pass
+        return [self.grade(marks) for marks in marks_column]
+
+    def grade_distribution(self, marks_counts):
+        """Count students per grade from (marks, count) pairs, every grade present"""
+        distribution = dict.fromkeys(self.grades, 0)
+        marks_counts = list(marks_counts)
+        grades = self.grade_many([marks for marks, _ in marks_counts])
+        for grade, (_, count) in zip(grades, marks_counts):
+            distribution[grade] += count
+        return distribution
+
+class Grading:
+    """The default grading scheme plus per-subject overrides, each compiled once on first use"""
+
+    def __init__(self, boundaries, colors, max_marks=100, subjects=None):
+        self.default = GradingScheme(boundaries, colors, max_marks)
+        self._colors = colors
+        self._overrides = subjects or {}
+        self._schemes = {}
+        self._lock = threading.Lock()
+
+    def for_subject(self, subject_name=None):
+        """Scheme for a subject, falling back to the default"""
+        scheme = self._schemes.get(subject_name)
+        if scheme is not None:
+            return scheme
+        override = self._overrides.get(subject_name)
+        if override is None:
+            return self.default
+
+        with self._lock:
+            scheme = self._schemes.get(subject_name)
+            if scheme is None:
+                scheme = self._schemes[subject_name] = GradingScheme(
+                    override.get('boundaries', self.default.boundaries),
+                    override.get('colors', self._colors),
+                    override.get('max_marks', self.default.max_marks)
+                )
+        return scheme
+
+    def append_grades(self, rows, columns, chunk_size=500):
+        """Yield each row as a tuple with its grade appended, grading a chunk of rows at a time"""
+        subject_index = columns.index('subject_name')
+        marks_index = columns.index('marks')
+        rows = iter(rows)
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                return
+            if self._overrides:
+                grades = [self.for_subject(row[subject_index]).grade(row[marks_index]) for row in chunk]
+            else:
+                grades = self.default.grade_many([row[marks_index] for row in chunk])
+            for row, grade in zip(chunk, grades):
+                yield tuple(row) + (grade,)
+
+def create_grading():
+    """Build the grading registry from configuration"""
+    config = get_config()
+    return Grading(config.GRADE_BOUNDARIES, config.GRADE_COLORS,
+                   config.GRADE_MAX_MARKS, config.SUBJECT_GRADING)
+
+# Global grading registry used for grades in stats, exports and templates
+grading = create_grading()
+
+def calculate_grade(marks, subject_name=None):
     """Calculate letter grade based on marks"""
-    if marks >= 90:
-        return 'A+'
-    elif marks >= 80:
-        return 'A'
-    elif marks >= 70:
-        return 'B+'
-    elif marks >= 60:
-        return 'B'
-    elif marks >= 50:
-        return 'C'
-    elif marks >= 40:
-        return 'D'
-    else:
-        return 'F'
+    scheme = grading.default if subject_name is None else grading.for_subject(subject_name)
+    return scheme.grade(marks)
+
+def interpolate_percentile(sorted_values, count, percentile):
+    """Linear-interpolated percentile given the values at the floor/ceil positions"""
+    position = (count - 1) * percentile / 100
+    lower = int(position)
+    lower_value = sorted_values[lower]
+    upper_value = sorted_values.get(lower + 1, lower_value)
+    return lower_value + (upper_value - lower_value) * (position - lower)
 
 def get_grade_color(marks):
-    """Get color code for grade display"""
-    if marks >= 80:
-        return '#28a745'  # Green
-    elif marks >= 60:
-        return '#ffc107'  # Yellow
-    elif marks >= 40:
-        return '#fd7e14'  # Orange
-    else:
-        return '#dc3545'  # Red
\ No newline at end of file
+    """Get color code for grade display (per-subject colours: grading.for_subject(name).color)"""
+    return grading.default.color(marks)
@@ -0,0 +1,160 @@
+from collections.abc import Mapping
+
+# Highest mark a student row may hold; grading tables are sized from it too
+MARKS_LIMIT = 1000
+
+class FieldError(ValueError):
+    """Raised by a field's clean() with the message for that field"""
+    pass
+
+class StringField:
+    """Required text, stripped, with length bounds"""
+
+    def __init__(self, name, label, min_length=1, max_length=None):
+        self.name = name
+        self.label = label
+        self.min_length = min_length
+        self.max_length = max_length if max_length is not None else float('inf')
+        # Messages are built once, not per validated value
+        self.required = f'{label} is required'
+        self.not_text = f'{label} must be text'
+        self.too_short = f'{label} must be at least {min_length} characters long'
+        self.too_long = f'{label} must be less than {max_length} characters'
+        # Stripped length range Schema.check accepts inline; an empty string is never valid
+        self.bounds = (max(min_length, 1), self.max_length)
+
+    def clean(self, value):
+        """Return the stripped string or raise FieldError"""
+        if value is None:
+            raise FieldError(self.required)
+        if not isinstance(value, str):
+            raise FieldError(self.not_text)
+        value = value.strip()
+        length = len(value)
+        if not length:
+            raise FieldError(self.required)
+        if length < self.min_length:
+            raise FieldError(self.too_short)
+        if length > self.max_length:
+            raise FieldError(self.too_long)
+        return value
+
+class IntegerField:
+    """Whole number (ints or numeric strings) within bounds"""
+
+    def __init__(self, name, label, minimum=None, maximum=None):
+        self.name = name
+        self.label = label
+        self.minimum = minimum if minimum is not None else float('-inf')
+        self.maximum = maximum if maximum is not None else float('inf')
+        self.invalid = f'{label} must be a valid number'
+        self.too_small = f'{label} cannot be negative' if minimum == 0 else f'{label} must be at least {minimum}'
+        self.too_large = f'{label} cannot exceed {maximum}'
+        self.bounds = (self.minimum, self.maximum)
+
+    def clean(self, value):
+        """Return the value as an int or raise FieldError"""
+        if isinstance(value, bool):
+            raise FieldError(self.invalid)
+        try:
+            value = int(value)
+        except (ValueError, TypeError):
+            raise FieldError(self.invalid) from None
+        if value < self.minimum:
+            raise FieldError(self.too_small)
+        if value > self.maximum:
+            raise FieldError(self.too_large)
+        return value
+
+class Schema:
+    """An ordered set of field rules applied in one pass per record.
+
+    check() is the fast path used for streams and batches: it returns the
+    cleaned values as a tuple in field order, or the errors keyed by field.
+    Plain str and int values are checked inline against each field's bounds;
+    anything else (missing keys, other types, out-of-range values) goes through
+    the fields' clean() methods, which also collect every error for a bad row.
+    validate() wraps check() in the {'valid', 'message', ...} dict used elsewhere.
+    """
+
+    def __init__(self, *fields):
+        self._fields = fields
+        self.fields = tuple(field.name for field in fields)
+        self._rules = tuple((field.name, isinstance(field, StringField)) + field.bounds for field in fields)
+
+    def check(self, record):
+        """Validate one mapping; returns (values tuple, None) or (None, {field: message})"""
+        # isinstance against the Mapping ABC is slow enough to matter per row, so dicts skip it
+        if record.__class__ is not dict and not isinstance(record, Mapping):
+            return None, {'_record': 'Expected an object'}
+        cleaned = ()
+        try:
+            for name, is_text, low, high in self._rules:
+                value = record[name]
+                kind = value.__class__
+                if kind is str:
+                    if is_text:
+                        value = value.strip()
+                        if low <= len(value) <= high:
+                            cleaned += (value,)
+                            continue
+                        break
+                    value = int(value)
+                elif kind is not int or is_text:
+                    break
+                if low <= value <= high:
+                    cleaned += (value,)
+                    continue
+                break
+            else:
+                return cleaned, None
+        except (KeyError, ValueError):
+            pass
+        get = record.get
+        return self._clean([get(name) for name in self.fields])
+
+    def check_values(self, *values):
+        """Validate positional values given in field order"""
+        return self.check(dict(zip(self.fields, values)))
+
+    def _clean(self, values):
+        """The clean() path for values the inline checks did not accept"""
+        errors = self._errors(values)
+        if errors:
+            return None, errors
+        return tuple(field.clean(value) for field, value in zip(self._fields, values)), None
+
+    def _errors(self, values):
+        """Every field's error for an invalid row, keyed by field name"""
+        errors = {}
+        for field, value in zip(self._fields, values):
+            try:
+                field.clean(value)
+            except FieldError as e:
+                errors[field.name] = str(e)
+        return errors
+
+    def validate(self, record):
+        """Validate one mapping into a result dict with cleaned data and per-field errors"""
+        values, errors = self.check(record)
+        if errors:
+            return {
+                'valid': False,
+                'message': format_errors(errors),
+                'errors': errors
+            }
+        return {
+            'valid': True,
+            'message': 'Valid data',
+            'data': dict(zip(self.fields, values))
+        }
+
+def format_errors(errors):
+    """Join per-field errors into one human-readable message"""
+    return '; '.join(errors.values())
+
+STUDENT_SCHEMA = Schema(
+    StringField('name', 'Student name', min_length=2, max_length=100),
+    StringField('subject_name', 'Subject name', min_length=2, max_length=100),
+    IntegerField('marks', 'Marks', minimum=0, maximum=MARKS_LIMIT)
+)
@@ -13,11 +13,15 @@ document.addEventListener('DOMContentLoaded', () => {
     const saveSpinner = document.getElementById('saveSpinner');
     const confirmDeleteBtn = document.getElementById('confirmDeleteBtn');
     const deleteSpinner = document.getElementById('deleteSpinner');
+    const loadMoreContainer = document.getElementById('loadMoreContainer');
+    const loadMoreBtn = document.getElementById('loadMoreBtn');
+    const loadMoreSpinner = document.getElementById('loadMoreSpinner');
 
     // State
     let currentStudentId = null;
     let isEditMode = false;
     let students = [];
+    let nextCursor = null;
 
     // Initialize dashboard
     init();
@@ -46,6 +50,9 @@ document.addEventListener('DOMContentLoaded', () => {
         // Delete confirmation
         confirmDeleteBtn.addEventListener('click', handleDeleteStudent);
 
+        // Pagination
+        loadMoreBtn.addEventListener('click', loadMoreStudents);
+
         // Close modals when clicking outside
         studentModal.addEventListener('click', (e) => {
             if (e.target === studentModal) {
@@ -68,7 +75,7 @@ document.addEventListener('DOMContentLoaded', () => {
         });
     }
 
-    // Load students from API
+    // Load the first page of students from API
     async function loadStudents() {
         try {
             showLoadingOverlay(true);
@@ -76,6 +83,7 @@ document.addEventListener('DOMContentLoaded', () => {
             
             if (response.success) {
                 students = response.students || [];
+                nextCursor = response.next_cursor || null;
                 renderStudentsTable();
             } else {
                 Toast.error(response.message || 'Failed to load students');
@@ -88,8 +96,34 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     }
 
+    // Append the next page of students
+    async function loadMoreStudents() {
+        if (!nextCursor) return;
+
+        Utils.showButtonLoading(loadMoreBtn, loadMoreSpinner);
+
+        try {
+            const response = await API.get(`/api/students?cursor=${encodeURIComponent(nextCursor)}`);
+
+            if (response.success) {
+                students = students.concat(response.students || []);
+                nextCursor = response.next_cursor || null;
+                renderStudentsTable();
+            } else {
+                Toast.error(response.message || 'Failed to load more students');
+            }
+        } catch (error) {
+            console.error('Error loading more students:', error);
+            Toast.error('Failed to load more students');
+        } finally {
+            Utils.hideButtonLoading(loadMoreBtn, loadMoreSpinner);
+        }
+    }
+
     // Render students table
     function renderStudentsTable() {
+        loadMoreContainer.style.display = nextCursor ? 'flex' : 'none';
+
         if (students.length === 0) {
             studentsTableBody.innerHTML = '';
             noStudentsMessage.style.display = 'block';
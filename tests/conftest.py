@@ -0,0 +1,41 @@
+"""Shared fixtures: the Flask app bound to a throwaway, migrated database."""
+import os
+import shutil
+import sys
+import tempfile
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+# The global db reads DATABASE_PATH when it is created, so this must run before
+# anything imports database.db_connection
+WORKDIR = tempfile.mkdtemp(prefix='teacher-portal-tests-')
+os.environ['DATABASE_PATH'] = os.path.join(WORKDIR, 'test.db')
+os.environ['INIT_DB_ON_STARTUP'] = '1'
+os.environ['BCRYPT_ROUNDS'] = '4'
+os.environ['CACHE_BACKEND'] = 'null'
+os.environ['SLOW_QUERY_MS'] = '10000'
+
+SAMPLE_USERNAME = 'teacher1'
+SAMPLE_PASSWORD = 'teacher123'
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(WORKDIR, ignore_errors=True)
+
+@pytest.fixture(scope='session')
+def app():
+    from app import app
+    return app
+
+@pytest.fixture
+def client(app):
+    client = app.test_client()
+    response = client.post('/api/auth/login', json={'username': SAMPLE_USERNAME, 'password': SAMPLE_PASSWORD})
+    assert response.status_code == 200
+    return client
+
+@pytest.fixture(scope='session')
+def teacher_id(app):
+    from database.db_connection import db
+    return db.execute_query("SELECT id FROM teachers WHERE username = ?", (SAMPLE_USERNAME,))[0]['id']
@@ -0,0 +1,22 @@
+"""Login behaviour around the best-effort password rehash."""
+import sqlite3
+from controllers import auth_controller
+from helpers.password_hasher import password_hasher
+
+def test_login_succeeds_when_rehash_write_fails(app, monkeypatch, caplog):
+    monkeypatch.setattr(password_hasher, 'rounds', password_hasher.rounds + 1)
+
+    execute_update = auth_controller.db.execute_update
+
+    def locked_for_rehash(query, params=None):
+        if 'SET password_hash' in query:
+            raise sqlite3.OperationalError('database is locked')
+        return execute_update(query, params)
+
+    monkeypatch.setattr(auth_controller.db, 'execute_update', locked_for_rehash)
+
+    response = app.test_client().post('/api/auth/login', json={'username': 'teacher1', 'password': 'teacher123'})
+
+    assert response.status_code == 200, response.get_json()
+    assert response.get_json()['success'] is True
+    assert 'Could not rehash password' in caplog.text
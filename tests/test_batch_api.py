@@ -0,0 +1,21 @@
+"""Request validation for POST /api/students/batch."""
+
+def test_non_json_body_is_rejected(client):
+    response = client.post('/api/students/batch', data='op=create', content_type='text/plain')
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
+
+def test_atomic_must_be_a_boolean(client):
+    response = client.post('/api/students/batch', json={
+        'operations': [{'op': 'create', 'name': 'Atomic Flag', 'subject_name': 'Flags', 'marks': 1}],
+        'atomic': 'false'
+    })
+    assert response.status_code == 400
+    assert response.get_json()['message'] == 'atomic must be true or false'
+
+def test_operation_list_body(client):
+    response = client.post('/api/students/batch', json=[
+        {'op': 'create', 'name': 'Atomic Flag', 'subject_name': 'Flags', 'marks': 1}
+    ])
+    assert response.status_code == 200
+    assert response.get_json()['applied'] == 1
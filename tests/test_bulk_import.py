@@ -0,0 +1,35 @@
+"""POST /api/students/bulk reads the whole upload before taking the writer."""
+from controllers.student_controller import StudentController
+from database.db_connection import db
+
+def test_upload_is_read_before_the_write_transaction(teacher_id):
+    seen = {}
+
+    def slow_upload():
+        yield 2, {'name': 'Spool One', 'subject_name': 'Spooling', 'marks': '4'}
+        # Another request writing while the upload is still arriving must not wait on it
+        seen['concurrent'] = StudentController.add_or_update_student('Spool Other', 'Spooling', 1, teacher_id)
+        yield 3, {'name': 'Spool Two', 'subject_name': 'Spooling', 'marks': '6'}
+
+    result = StudentController.bulk_import(slow_upload(), teacher_id)
+
+    assert seen['concurrent']['success'], seen['concurrent']
+    assert result['success'] and result['imported'] == 2, result
+
+def test_spooled_rows_round_trip(teacher_id, monkeypatch):
+    from config import get_config
+    monkeypatch.setattr(get_config(), 'BULK_IMPORT_SPOOL_MEMORY', 64)
+    monkeypatch.setattr(get_config(), 'BULK_IMPORT_BATCH_SIZE', 7)
+
+    names = [f'Quoted, "Student"\n{n}' for n in range(20)]
+    records = [(n + 2, {'name': name, 'subject_name': 'Spool Trip', 'marks': n}) for n, name in enumerate(names)]
+    records.append((22, {'name': '', 'subject_name': 'Spool Trip', 'marks': 1}))
+
+    result = StudentController.bulk_import(iter(records), teacher_id)
+
+    assert result['imported'] == 20 and result['failed'] == 1, result
+    rows = db.execute_query(
+        "SELECT name, marks FROM students WHERE teacher_id = ? AND subject_name = 'Spool Trip'",
+        (teacher_id,)
+    )
+    assert {row['name']: row['marks'] for row in rows} == {name: n for n, name in enumerate(names)}
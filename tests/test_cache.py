@@ -0,0 +1,20 @@
+"""Cache entries are sized without encoding them."""
+from helpers.cache import MemoryCache, estimate_size
+from helpers.json_provider import RawJSON
+
+def test_raw_json_is_sized_by_length():
+    page = RawJSON('[' + ','.join('{"id":%d}' % n for n in range(100)) + ']')
+    assert estimate_size(page) == len(page) + 2
+
+def test_long_lists_are_extrapolated_from_a_sample():
+    rows = [{'id': n, 'name': 'Student'} for n in range(1000)]
+    assert estimate_size(rows) == 1000 * (estimate_size(rows[0]) + 1) + 2
+
+def test_size_cap_evicts_oldest_entries():
+    cache = MemoryCache(max_bytes=250)
+    cache.set(1, 'a', RawJSON('x' * 100))
+    cache.set(1, 'b', RawJSON('y' * 100))
+    cache.set(2, 'c', 'z', size=100)
+    assert cache.get(1, 'a') is None
+    assert cache.get(1, 'b') == 'y' * 100
+    assert cache.stats()['bytes'] == 202
@@ -0,0 +1,24 @@
+"""Compiled grading schemes agree with the per-mark functions."""
+from helpers.utils import GradingScheme, calculate_grade, get_grade_color, grading
+
+def test_default_colors_on_a_100_mark_scale():
+    assert [get_grade_color(m) for m in (100, 80, 79.5, 60, 40, 39, 0)] == [
+        '#28a745', '#28a745', '#ffc107', '#ffc107', '#fd7e14', '#dc3545', '#dc3545']
+
+def test_colors_follow_the_configured_max_marks(monkeypatch):
+    scheme = GradingScheme(grading.default.boundaries, ((80, 'green'), (40, 'amber'), (0, 'red')), max_marks=50)
+    monkeypatch.setattr(grading, 'default', scheme)
+    assert [get_grade_color(m) for m in (50, 40, 39, 20, 19)] == ['green', 'green', 'amber', 'amber', 'red']
+
+def test_batch_grading_matches_per_mark_grades():
+    marks = list(range(0, 101)) + [55.5]
+    assert grading.default.grade_many(marks) == [calculate_grade(m) for m in marks]
+
+    distribution = grading.default.grade_distribution([(95, 2), (85, 1), (10, 4)])
+    assert distribution == {'A+': 2, 'A': 1, 'B+': 0, 'B': 0, 'C': 0, 'D': 0, 'F': 4}
+
+def test_append_grades_in_chunks():
+    columns = ['id', 'name', 'subject_name', 'marks']
+    rows = [(n, f'Student {n}', 'Mathematics', n % 101) for n in range(1200)]
+    graded = list(grading.append_grades(iter(rows), columns, chunk_size=500))
+    assert graded == [row + (calculate_grade(row[3]),) for row in rows]
@@ -0,0 +1,93 @@
+"""Every statement the controllers run against a migrated schema must be index-backed."""
+import re
+import pytest
+from controllers.auth_controller import AuthController
+from controllers.student_controller import StudentController, SORT_KEYS
+from database.db_connection import db
+
+DATA_STATEMENT = re.compile(r'^\s*(SELECT|INSERT|UPDATE|DELETE|WITH)\b', re.IGNORECASE)
+
+# A full pass over a real table; subquery results, constant rows and FTS virtual tables are fine
+TABLE_SCAN = re.compile(r'^SCAN (?!\(|CONSTANT ROW)(\w+)\b(?! VIRTUAL TABLE)')
+
+# FTS5 reads its own shadow tables through quoted 'main'.'...' statements
+FTS_INTERNAL = "'main'."
+
+
+@pytest.fixture
+def traced_statements(app):
+    """Record the expanded SQL of every statement run on connections opened during the test"""
+    statements = []
+    create_connection = db._create_connection
+
+    def traced(*args, **kwargs):
+        conn = create_connection(*args, **kwargs)
+        conn.set_trace_callback(statements.append)
+        return conn
+
+    db.close()
+    db._create_connection = traced
+    try:
+        yield statements
+    finally:
+        del db._create_connection
+        db.close()
+
+def run_controller_queries(teacher_id):
+    for sort in SORT_KEYS:
+        for order in ('asc', 'desc'):
+            page = StudentController.get_all_students(teacher_id, limit=2, sort=sort, order=order)
+            assert page['success'], page
+            StudentController.get_all_students(teacher_id, limit=2, sort=sort, order=order,
+                                               cursor=page['next_cursor'], as_json=True)
+    StudentController.get_all_students(teacher_id, subject='Mathematics', name_prefix='A', min_marks=10, max_marks=90)
+    StudentController.search_students(teacher_id, 'ali')
+    assert StudentController.get_statistics(teacher_id)['success']
+    list(StudentController.iter_students(teacher_id))
+
+    created = StudentController.add_or_update_student('Plan Student', 'Mathematics', 10, teacher_id)
+    assert created['success'], created
+    student_id = created['student_id']
+    StudentController.add_or_update_student('Plan Student', 'Mathematics', 5, teacher_id)
+    StudentController.get_student_by_id(student_id, teacher_id)
+    StudentController.update_student(student_id, 'Plan Student', 'Physics', 20, teacher_id)
+    StudentController.batch_operations([
+        {'op': 'create', 'name': 'Plan Batch', 'subject_name': 'Physics', 'marks': 1},
+        {'op': 'update', 'id': student_id, 'name': 'Plan Student', 'subject_name': 'Physics', 'marks': 2},
+        {'op': 'delete', 'id': student_id}
+    ], teacher_id)
+    StudentController.bulk_import(iter([(2, {'name': 'Plan Bulk', 'subject_name': 'Physics', 'marks': '3'})]), teacher_id)
+
+    AuthController.authenticate_teacher('teacher1', 'teacher123')
+    AuthController.get_teacher_by_id(teacher_id)
+    AuthController.register_teacher('plan_teacher', 'plan@example.com', 'plan-password', 'Plan Teacher')
+
+def test_controller_queries_are_index_backed(traced_statements, teacher_id):
+    run_controller_queries(teacher_id)
+
+    statements = [sql for sql in traced_statements if DATA_STATEMENT.match(sql) and FTS_INTERNAL not in sql]
+    assert any('FROM students' in sql for sql in statements)
+
+    scans = []
+    with db.read_connection() as conn:
+        for sql in statements:
+            for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}'):
+                if TABLE_SCAN.match(row['detail']):
+                    scans.append((row['detail'], ' '.join(sql.split())))
+    assert not scans, scans
+
+def test_name_prefix_filter_is_case_insensitive(traced_statements, teacher_id):
+    for prefix in ('al', 'AL', 'Al', 'aLiCe j'):
+        result = StudentController.get_all_students(teacher_id, name_prefix=prefix)
+        assert result['success'], result
+        assert result['students'], prefix
+        assert all(student['name'].lower().startswith(prefix.lower()) for student in result['students'])
+
+    assert StudentController.get_all_students(teacher_id, name_prefix='Z')['success']
+
+    prefix_queries = [sql for sql in traced_statements if 'COLLATE NOCASE' in sql]
+    assert prefix_queries
+    with db.read_connection() as conn:
+        for sql in prefix_queries:
+            plan = ' '.join(row['detail'] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}'))
+            assert 'idx_students_teacher_name_nocase (teacher_id=? AND name>? AND name<?)' in plan, plan
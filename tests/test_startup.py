@@ -0,0 +1,59 @@
+"""Database setup happens once at startup, not in a per-request hook."""
+import json
+import os
+import subprocess
+import sys
+from conftest import PROJECT_ROOT
+
+# Generous bounds for a cold import against an empty database; they catch setup
+# work creeping back into startup (or bcrypt at full cost), not small regressions
+MAX_IMPORT_SECONDS = 5.0
+MAX_DB_STARTUP_SECONDS = 2.0
+
+STARTUP_PROBE = """
+import json, time
+started = time.perf_counter()
+from app import app
+import_seconds = time.perf_counter() - started
+print(json.dumps({
+    'import_seconds': import_seconds,
+    'db_startup_seconds': app.config.get('DB_STARTUP_SECONDS'),
+    'before_request': [func.__name__ for funcs in app.before_request_funcs.values() for func in funcs],
+}))
+"""
+
+def test_startup_initializes_database_once(tmp_path):
+    environ = dict(os.environ, DATABASE_PATH=str(tmp_path / 'startup.db'))
+    completed = subprocess.run(
+        [sys.executable, '-c', STARTUP_PROBE],
+        cwd=PROJECT_ROOT, env=environ, capture_output=True, text=True, check=True
+    )
+    startup = json.loads(completed.stdout.strip().splitlines()[-1])
+
+    assert 'ensure_tables_exist' not in startup['before_request']
+    assert startup['before_request'] == ['start_request_timer']
+    assert startup['db_startup_seconds'] is not None
+    assert startup['db_startup_seconds'] < MAX_DB_STARTUP_SECONDS
+    assert startup['import_seconds'] < MAX_IMPORT_SECONDS
+
+def test_requests_do_not_initialize_the_database(client, monkeypatch):
+    import app as app_module
+
+    def fail(*args, **kwargs):
+        raise AssertionError('initialize_database ran during a request')
+
+    monkeypatch.setattr(app_module, 'initialize_database', fail)
+    assert client.get('/api/students').status_code == 200
+
+def test_startup_fails_when_the_database_cannot_be_initialized(tmp_path):
+    not_a_database = tmp_path / 'broken.db'
+    not_a_database.write_bytes(b'this is not an SQLite database' * 100)
+    environ = dict(os.environ, DATABASE_PATH=str(not_a_database))
+    completed = subprocess.run(
+        [sys.executable, '-c', 'import app'],
+        cwd=PROJECT_ROOT, env=environ, capture_output=True, text=True
+    )
+
+    assert completed.returncode != 0
+    assert 'RuntimeError: Database initialization failed' in completed.stderr
+    assert 'Database ready' not in completed.stderr
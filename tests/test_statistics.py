@@ -0,0 +1,35 @@
+"""GET /api/students/stats reads everything from one snapshot."""
+from controllers import student_controller
+from controllers.student_controller import StudentController
+from database.db_connection import db
+
+def test_statistics_ignore_writes_committed_mid_computation(teacher_id, monkeypatch):
+    subject = 'Vanishing'
+    for name, marks in (('Vanish One', 95), ('Vanish Two', 72), ('Vanish Three', 41)):
+        assert StudentController.add_or_update_student(name, subject, marks, teacher_id)['success']
+
+    for_subject = student_controller.grading.for_subject
+    deleted = []
+
+    def delete_subject_once(name):
+        # Runs after the summary and mark counts were read, before the per-subject probes
+        if not deleted:
+            deleted.append(db.execute_update(
+                "DELETE FROM students WHERE teacher_id = ? AND subject_name = ?", (teacher_id, subject)
+            ))
+        return for_subject(name)
+
+    monkeypatch.setattr(student_controller.grading, 'for_subject', delete_subject_once)
+    result = StudentController.get_statistics(teacher_id)
+
+    assert deleted == [3]
+    assert result['success'], result
+    stats = next(item for item in result['subjects'] if item['subject_name'] == subject)
+    assert stats['count'] == 3
+    assert sum(stats['grades'].values()) == 3
+    assert stats['max'] == 95
+    assert [student['marks'] for student in stats['top_students']] == [95, 72, 41]
+
+    monkeypatch.undo()
+    after = StudentController.get_statistics(teacher_id)
+    assert subject not in [item['subject_name'] for item in after['subjects']]
@@ -0,0 +1,45 @@
+"""add_or_update_student accumulates marks atomically and reports created exactly once."""
+from concurrent.futures import ThreadPoolExecutor
+from controllers.student_controller import StudentController
+from database.db_connection import db
+
+STUDENTS = 10
+ADDS_PER_STUDENT = 30
+THREADS = 16
+
+def test_parallel_adds_accumulate_marks(teacher_id):
+    subject = 'Concurrency'
+    adds = [
+        (f'Parallel Student {n}', subject, marks, teacher_id)
+        for marks in range(1, ADDS_PER_STUDENT + 1)
+        for n in range(STUDENTS)
+    ]
+
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        results = list(executor.map(lambda args: StudentController.add_or_update_student(*args), adds))
+
+    assert all(result['success'] for result in results), [r for r in results if not r['success']][:3]
+    assert sum(result['action'] == 'created' for result in results) == STUDENTS
+
+    rows = db.execute_query(
+        "SELECT name, marks FROM students WHERE teacher_id = ? AND subject_name = ?",
+        (teacher_id, subject)
+    )
+    expected_total = ADDS_PER_STUDENT * (ADDS_PER_STUDENT + 1) // 2
+    assert {row['name']: row['marks'] for row in rows} == {
+        f'Parallel Student {n}': expected_total for n in range(STUDENTS)
+    }
+
+def test_new_student_after_rolled_back_batch_is_created(teacher_id):
+    rolled_back = StudentController.batch_operations([
+        {'op': 'create', 'name': 'Rolled Back', 'subject_name': 'Rollback', 'marks': 5},
+        {'op': 'update', 'id': 0, 'name': 'Missing', 'subject_name': 'Rollback', 'marks': 5}
+    ], teacher_id, atomic=True)
+    assert not rolled_back['success']
+
+    result = StudentController.add_or_update_student('Brand New', 'Rollback', 7, teacher_id)
+    assert result['action'] == 'created'
+
+    result = StudentController.add_or_update_student('Brand New', 'Rollback', 3, teacher_id)
+    assert result['action'] == 'updated'
+    assert result['new_marks'] == 10
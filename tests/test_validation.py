@@ -0,0 +1,57 @@
+"""STUDENT_SCHEMA rules, as applied by the single-row, bulk and batch paths."""
+import pytest
+from controllers.student_controller import StudentController
+from helpers.validation import STUDENT_SCHEMA
+
+@pytest.mark.parametrize('name', [['x', 'y'], {'first': 'Ann'}, 42, True])
+def test_non_string_names_are_rejected(name):
+    values, errors = STUDENT_SCHEMA.check({'name': name, 'subject_name': 'Mathematics', 'marks': 5})
+    assert values is None
+    assert errors == {'name': 'Student name must be text'}
+
+@pytest.mark.parametrize('marks, expected', [(0, 0), ('42', 42), (' 7 ', 7)])
+def test_marks_accept_integers_and_numeric_strings(marks, expected):
+    values, errors = STUDENT_SCHEMA.check_values(' Ann Lee ', 'Physics', marks)
+    assert errors is None
+    assert values == ('Ann Lee', 'Physics', expected)
+
+@pytest.mark.parametrize('record', [
+    {'name': 'Ann Lee', 'subject_name': 'Physics', 'marks': 5.0},
+    {'name': 'Ann Lee', 'subject_name': 'Physics', 'marks': 1000},
+    {'name': ' Al ', 'subject_name': 'Physics', 'marks': '1000'},
+    {'name': 'Ann Lee', 'subject_name': '   ', 'marks': 5},
+    {'name': 'A' * 101, 'subject_name': 'Physics', 'marks': 5},
+    {'name': 'Ann Lee', 'marks': 5},
+    {'name': 'Ann Lee', 'subject_name': 'Physics', 'marks': '-3'},
+])
+def test_inline_checks_agree_with_field_rules(record):
+    values = [record.get(name) for name in STUDENT_SCHEMA.fields]
+    assert STUDENT_SCHEMA.check(record) == STUDENT_SCHEMA._clean(values)
+
+@pytest.mark.parametrize('marks', [True, None, 'ten', -1, 1001])
+def test_invalid_marks_are_rejected(marks):
+    _, errors = STUDENT_SCHEMA.check_values('Ann Lee', 'Physics', marks)
+    assert set(errors) == {'marks'}
+
+def test_all_field_errors_are_reported():
+    _, errors = STUDENT_SCHEMA.check({'name': 'A', 'marks': 'x'})
+    assert set(errors) == {'name', 'subject_name', 'marks'}
+    assert STUDENT_SCHEMA.check(['Ann']) == (None, {'_record': 'Expected an object'})
+
+def test_routes_return_field_errors(client):
+    response = client.post('/api/students', json={'name': ['x', 'y'], 'subject_name': 'Physics', 'marks': 5})
+    assert response.status_code == 400
+    assert response.get_json()['errors'] == {'name': 'Student name must be text'}
+
+    response = client.post('/api/students', json={'name': 'Zero Marks', 'subject_name': 'Physics', 'marks': 0})
+    assert response.status_code == 200
+
+def test_bulk_and_batch_reject_non_string_fields(teacher_id):
+    result = StudentController.bulk_import(iter([(1, {'name': 12, 'subject_name': 'Physics', 'marks': 1})]), teacher_id)
+    assert result['imported'] == 0
+    assert result['errors'][0]['errors'] == {'name': 'Student name must be text'}
+
+    result = StudentController.batch_operations(
+        [{'op': 'create', 'name': 'Batch Text', 'subject_name': {'x': 1}, 'marks': 1}], teacher_id
+    )
+    assert result['results'][0]['errors'] == {'subject_name': 'Subject name must be text'}